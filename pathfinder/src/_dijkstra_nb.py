@@ -0,0 +1,388 @@
+"""
+@file _dijkstra_nb.py
+@brief JIT-компилируемое ядро алгоритма Дейкстры для прямоугольных сеток.
+
+@details
+Внутренний цикл Дейкстры по плотной сетке стоимостей, скомпилированный
+Numba: двоичная куча хранится в паре массивов (расстояние, индекс
+клетки), так что горячий цикл целиком выполняется вне интерпретатора.
+Модуль импортируется лениво; при отсутствии numba вызывающий код
+использует чистую Python-реализацию.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def dijkstra(flat_cost, height, width, start_idx, dist, touched):
+    """
+    Заполняет массив минимальных стоимостей пути от стартовой клетки.
+
+    @param flat_cost: одномерный float32-массив стоимостей входа в клетку
+                      длины height * width; inf - непроходимая клетка
+    @param height: высота сетки
+    @param width: ширина сетки
+    @param start_idx: плоский индекс стартовой клетки
+    @param dist: одномерный float32-массив длины height * width,
+                 предзаполненный inf; заполняется на месте
+    @param touched: одномерный int32-массив длины height * width;
+                    заполняется индексами затронутых клеток, чтобы
+                    вызывающий код мог сбросить буфер без полного memset
+    @return число затронутых клеток (занятый префикс touched)
+    """
+    n = height * width
+    closed = np.zeros(n, dtype=np.uint8)
+    n_touched = 0
+
+    # Двоичная куча в двух параллельных массивах с ростом по мере
+    # надобности; ключи хранятся в float32, как и сами расстояния, -
+    # куча вдвое компактнее и без преобразований типов при сравнении
+    heap_d = np.empty(1024, dtype=np.float32)
+    heap_v = np.empty(1024, dtype=np.int64)
+
+    dist[start_idx] = 0.0
+    touched[0] = start_idx
+    n_touched = 1
+    heap_d[0] = 0.0
+    heap_v[0] = start_idx
+    size = 1
+
+    while size > 0:
+        # Извлекаем вершину с минимальным расстоянием
+        current = heap_v[0]
+        size -= 1
+        heap_d[0] = heap_d[size]
+        heap_v[0] = heap_v[size]
+        pos = 0
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap_d[child + 1] < heap_d[child]:
+                child += 1
+            if heap_d[child] < heap_d[pos]:
+                heap_d[pos], heap_d[child] = heap_d[child], heap_d[pos]
+                heap_v[pos], heap_v[child] = heap_v[child], heap_v[pos]
+                pos = child
+            else:
+                break
+
+        # Устаревшие записи очереди (ленивое удаление)
+        if closed[current]:
+            continue
+        closed[current] = 1
+
+        ci = current // width
+        cj = current % width
+        d_current = dist[current]
+
+        for k in range(4):
+            if k == 0:
+                ni, nj = ci - 1, cj
+            elif k == 1:
+                ni, nj = ci + 1, cj
+            elif k == 2:
+                ni, nj = ci, cj - 1
+            else:
+                ni, nj = ci, cj + 1
+            if ni < 0 or ni >= height or nj < 0 or nj >= width:
+                continue
+
+            neighbor = ni * width + nj
+            if closed[neighbor]:
+                continue
+
+            step = flat_cost[neighbor]
+            if step == np.inf:
+                continue
+
+            tentative = d_current + step
+            if tentative >= dist[neighbor]:
+                continue
+
+            if dist[neighbor] == np.inf:
+                touched[n_touched] = neighbor
+                n_touched += 1
+            dist[neighbor] = tentative
+
+            # Вставка в кучу с просеиванием вверх
+            if size >= heap_d.shape[0]:
+                new_d = np.empty(heap_d.shape[0] * 2, dtype=np.float32)
+                new_v = np.empty(heap_v.shape[0] * 2, dtype=np.int64)
+                new_d[:size] = heap_d[:size]
+                new_v[:size] = heap_v[:size]
+                heap_d = new_d
+                heap_v = new_v
+            pos = size
+            heap_d[pos] = tentative
+            heap_v[pos] = neighbor
+            size += 1
+            while pos > 0:
+                parent = (pos - 1) // 2
+                if heap_d[pos] < heap_d[parent]:
+                    heap_d[pos], heap_d[parent] = heap_d[parent], heap_d[pos]
+                    heap_v[pos], heap_v[parent] = heap_v[parent], heap_v[pos]
+                    pos = parent
+                else:
+                    break
+
+    return n_touched
+
+
+@njit(cache=True)
+def dijkstra_path(flat_cost, height, width, start_idx, end_idx):
+    """
+    Ищет кратчайший путь между двумя клетками, возвращая предшественников.
+
+    @details
+    Тот же цикл, что и в dijkstra, но с массивом предшественников для
+    восстановления пути и ранним выходом: поиск обрывается, как только
+    конечная клетка извлечена из очереди, не досчитывая остаток поля.
+
+    @param flat_cost: одномерный float32-массив стоимостей входа в клетку
+                      длины height * width; inf - непроходимая клетка
+    @param height: высота сетки
+    @param width: ширина сетки
+    @param start_idx: плоский индекс начальной клетки
+    @param end_idx: плоский индекс конечной клетки
+    @return кортеж (prev, cost): int32-массив предшественников (-1 -
+            клетка не достигнута) и стоимость пути до конечной клетки
+            (inf, если пути нет)
+    """
+    n = height * width
+    dist = np.full(n, np.inf, dtype=np.float32)
+    prev = np.full(n, -1, dtype=np.int32)
+    closed = np.zeros(n, dtype=np.uint8)
+
+    heap_d = np.empty(1024, dtype=np.float32)
+    heap_v = np.empty(1024, dtype=np.int64)
+
+    dist[start_idx] = 0.0
+    heap_d[0] = 0.0
+    heap_v[0] = start_idx
+    size = 1
+
+    while size > 0:
+        current = heap_v[0]
+        size -= 1
+        heap_d[0] = heap_d[size]
+        heap_v[0] = heap_v[size]
+        pos = 0
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap_d[child + 1] < heap_d[child]:
+                child += 1
+            if heap_d[child] < heap_d[pos]:
+                heap_d[pos], heap_d[child] = heap_d[child], heap_d[pos]
+                heap_v[pos], heap_v[child] = heap_v[child], heap_v[pos]
+                pos = child
+            else:
+                break
+
+        if current == end_idx:
+            break
+        if closed[current]:
+            continue
+        closed[current] = 1
+
+        ci = current // width
+        cj = current % width
+        d_current = dist[current]
+
+        for k in range(4):
+            if k == 0:
+                ni, nj = ci - 1, cj
+            elif k == 1:
+                ni, nj = ci + 1, cj
+            elif k == 2:
+                ni, nj = ci, cj - 1
+            else:
+                ni, nj = ci, cj + 1
+            if ni < 0 or ni >= height or nj < 0 or nj >= width:
+                continue
+
+            neighbor = ni * width + nj
+            if closed[neighbor]:
+                continue
+
+            step = flat_cost[neighbor]
+            if step == np.inf:
+                continue
+
+            tentative = d_current + step
+            if tentative >= dist[neighbor]:
+                continue
+
+            dist[neighbor] = tentative
+            prev[neighbor] = current
+
+            if size >= heap_d.shape[0]:
+                new_d = np.empty(heap_d.shape[0] * 2, dtype=np.float32)
+                new_v = np.empty(heap_v.shape[0] * 2, dtype=np.int64)
+                new_d[:size] = heap_d[:size]
+                new_v[:size] = heap_v[:size]
+                heap_d = new_d
+                heap_v = new_v
+            pos = size
+            heap_d[pos] = tentative
+            heap_v[pos] = neighbor
+            size += 1
+            while pos > 0:
+                parent = (pos - 1) // 2
+                if heap_d[pos] < heap_d[parent]:
+                    heap_d[pos], heap_d[parent] = heap_d[parent], heap_d[pos]
+                    heap_v[pos], heap_v[parent] = heap_v[parent], heap_v[pos]
+                    pos = parent
+                else:
+                    break
+
+    return prev, dist[end_idx]
+
+
+@njit(cache=True)
+def dial_dijkstra(flat_icost, height, width, start_idx, inv_scale, dist,
+                  touched):
+    """
+    Заполняет поле расстояний карманной очередью Дайала.
+
+    @details
+    Для целочисленных стоимостей очередь с приоритетами вырождается в
+    массив карманов, индексируемый расстоянием: извлечение минимума -
+    продвижение курсора по карманам, вставка и уменьшение ключа - O(1)
+    операции над двусвязными списками в плоских массивах. Логарифм кучи
+    исчезает вместе со сравнениями ключей. Нефинализированные вершины
+    лежат в окне расстояний ширины max_cost + 1, поэтому достаточно
+    стольких же циклических карманов (индекс - расстояние по модулю),
+    а не кармана на каждое возможное расстояние.
+
+    @param flat_icost: одномерный int32-массив целочисленных стоимостей
+                       входа в клетку; отрицательное значение -
+                       непроходимая клетка
+    @param height: высота сетки
+    @param width: ширина сетки
+    @param start_idx: плоский индекс стартовой клетки
+    @param inv_scale: множитель перевода целочисленных расстояний
+                      обратно в исходные единицы
+    @param dist: одномерный float32-массив длины height * width,
+                 предзаполненный inf; заполняется на месте
+    @param touched: одномерный int32-массив длины height * width;
+                    заполняется индексами затронутых клеток, чтобы
+                    вызывающий код мог сбросить буфер без полного memset
+    @return число затронутых клеток (занятый префикс touched)
+    """
+    n = height * width
+    unreached = np.int32(2147483647)
+
+    max_cost = 0
+    for i in range(n):
+        if flat_icost[i] > max_cost:
+            max_cost = flat_icost[i]
+    # Открытые вершины всегда лежат в окне [cur, cur + max_cost],
+    # поэтому хватает max_cost + 1 циклических карманов
+    n_buckets = max_cost + 1
+
+    dist_i = np.full(n, unreached, dtype=np.int32)
+    # Карманы как двусвязные списки в плоских массивах: head - первая
+    # клетка кармана, nxt/prv - связи внутри кармана
+    head = np.full(n_buckets, -1, dtype=np.int32)
+    nxt = np.full(n, -1, dtype=np.int32)
+    prv = np.full(n, -1, dtype=np.int32)
+
+    dist_i[start_idx] = 0
+    head[0] = start_idx
+    remaining = 1
+    cur = 0
+
+    while remaining > 0:
+        node = head[cur % n_buckets]
+        if node == -1:
+            cur += 1
+            continue
+
+        # Извлечение из текущего кармана
+        head[cur % n_buckets] = nxt[node]
+        if nxt[node] != -1:
+            prv[nxt[node]] = -1
+        nxt[node] = -1
+        remaining -= 1
+
+        ci = node // width
+        cj = node % width
+
+        for k in range(4):
+            if k == 0:
+                ni, nj = ci - 1, cj
+            elif k == 1:
+                ni, nj = ci + 1, cj
+            elif k == 2:
+                ni, nj = ci, cj - 1
+            else:
+                ni, nj = ci, cj + 1
+            if ni < 0 or ni >= height or nj < 0 or nj >= width:
+                continue
+
+            neighbor = ni * width + nj
+            step = flat_icost[neighbor]
+            if step < 0:
+                continue
+
+            tentative = cur + step
+            old = dist_i[neighbor]
+            if tentative >= old:
+                continue
+
+            # Уменьшение ключа: клетка выщепляется из старого кармана
+            if old != unreached:
+                old_bucket = old % n_buckets
+                if prv[neighbor] == -1:
+                    head[old_bucket] = nxt[neighbor]
+                else:
+                    nxt[prv[neighbor]] = nxt[neighbor]
+                if nxt[neighbor] != -1:
+                    prv[nxt[neighbor]] = prv[neighbor]
+            else:
+                remaining += 1
+
+            dist_i[neighbor] = tentative
+            new_bucket = tentative % n_buckets
+            nxt[neighbor] = head[new_bucket]
+            prv[neighbor] = -1
+            if head[new_bucket] != -1:
+                prv[head[new_bucket]] = neighbor
+            head[new_bucket] = neighbor
+
+    n_touched = 0
+    for i in range(n):
+        if dist_i[i] != unreached:
+            dist[i] = dist_i[i] * inv_scale
+            touched[n_touched] = i
+            n_touched += 1
+
+    return n_touched
+
+
+@njit(cache=True, parallel=True)
+def multi_dijkstra(flat_cost, height, width, start_idxs, out):
+    """
+    Параллельно заполняет поля расстояний для нескольких источников.
+
+    @details
+    Поиски от разных источников независимы, поэтому они раздаются
+    потокам через prange; каждая итерация владеет собственной строкой
+    out и собственными кучами внутри dijkstra, синхронизация не нужна.
+
+    @param flat_cost: одномерный float32-массив стоимостей входа в клетку
+    @param height: высота сетки
+    @param width: ширина сетки
+    @param start_idxs: int64-массив плоских индексов стартовых клеток
+    @param out: массив (S, height * width) float32, предзаполненный inf;
+                строка s заполняется полем источника s на месте
+    """
+    for s in prange(start_idxs.shape[0]):
+        # Каждый поток получает собственный список затронутых клеток;
+        # строки out приходят свежими, поэтому сброс не нужен
+        touched = np.empty(height * width, dtype=np.int32)
+        dijkstra(flat_cost, height, width, start_idxs[s], out[s], touched)
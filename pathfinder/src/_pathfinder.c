@@ -0,0 +1,137 @@
+/*
+ * _pathfinder.c - реализация алгоритма Дейкстры на C.
+ *
+ * Граф передается в формате CSR (indptr/indices/weights), вершины
+ * нумеруются как row * width + col. Внутри используется 4-арная
+ * куча с "ленивым удалением": устаревшие элементы отбрасываются
+ * при извлечении сравнением со significant текущей дистанцией.
+ *
+ * Библиотека загружается из Python через ctypes (см. terrain_pathfinder.py).
+ */
+
+#include <stdint.h>
+#include <stdlib.h>
+#include <math.h>
+
+typedef struct {
+    float   *key;   /* дистанция */
+    int32_t *node;  /* номер вершины */
+    int32_t  size;
+    int32_t  cap;
+} heap4_t;
+
+static int heap_push(heap4_t *h, float key, int32_t node)
+{
+    if (h->size == h->cap) {
+        /* Буферы расширяются по одному с немедленным обновлением
+         * указателя в структуре: после неудачного realloc второго
+         * массива оба указателя остаются действительными, и вызывающий
+         * код освобождает их обычным путем. */
+        int32_t new_cap = h->cap * 2;
+        float *nk = realloc(h->key, (size_t)new_cap * sizeof(float));
+        if (nk == NULL)
+            return -1;
+        h->key = nk;
+        int32_t *nn = realloc(h->node, (size_t)new_cap * sizeof(int32_t));
+        if (nn == NULL)
+            return -1;
+        h->node = nn;
+        h->cap = new_cap;
+    }
+
+    int32_t i = h->size++;
+    while (i > 0) {
+        int32_t parent = (i - 1) / 4;
+        if (h->key[parent] <= key)
+            break;
+        h->key[i] = h->key[parent];
+        h->node[i] = h->node[parent];
+        i = parent;
+    }
+    h->key[i] = key;
+    h->node[i] = node;
+    return 0;
+}
+
+static int32_t heap_pop(heap4_t *h, float *key_out)
+{
+    int32_t top_node = h->node[0];
+    *key_out = h->key[0];
+
+    h->size--;
+    float   last_key = h->key[h->size];
+    int32_t last_node = h->node[h->size];
+
+    int32_t i = 0;
+    for (;;) {
+        int32_t first = 4 * i + 1;
+        if (first >= h->size)
+            break;
+        int32_t best = first;
+        int32_t stop = first + 4 < h->size ? first + 4 : h->size;
+        for (int32_t c = first + 1; c < stop; c++) {
+            if (h->key[c] < h->key[best])
+                best = c;
+        }
+        if (h->key[best] >= last_key)
+            break;
+        h->key[i] = h->key[best];
+        h->node[i] = h->node[best];
+        i = best;
+    }
+    h->key[i] = last_key;
+    h->node[i] = last_node;
+
+    return top_node;
+}
+
+void dijkstra(const int32_t *indptr, const int32_t *indices,
+              const float *weights, int32_t n, int32_t src, int32_t dst,
+              float *cost_out, int32_t *came_from_out)
+{
+    for (int32_t i = 0; i < n; i++) {
+        cost_out[i] = INFINITY;
+        came_from_out[i] = -1;
+    }
+
+    heap4_t h;
+    h.cap = n > 16 ? n : 16;
+    h.size = 0;
+    h.key = malloc((size_t)h.cap * sizeof(float));
+    h.node = malloc((size_t)h.cap * sizeof(int32_t));
+    if (h.key == NULL || h.node == NULL) {
+        free(h.key);
+        free(h.node);
+        return;
+    }
+
+    cost_out[src] = 0.0f;
+    heap_push(&h, 0.0f, src);
+
+    while (h.size > 0) {
+        float d;
+        int32_t u = heap_pop(&h, &d);
+
+        if (u == dst)
+            break;
+        if (d > cost_out[u])
+            continue; /* устаревший элемент кучи */
+
+        for (int32_t k = indptr[u]; k < indptr[u + 1]; k++) {
+            int32_t v = indices[k];
+            float nd = d + weights[k];
+            if (nd < cost_out[v]) {
+                cost_out[v] = nd;
+                came_from_out[v] = u;
+                if (heap_push(&h, nd, v) != 0) {
+                    free(h.key);
+                    free(h.node);
+                    return;
+                }
+            }
+        }
+    }
+
+    free(h.key);
+    free(h.node);
+}
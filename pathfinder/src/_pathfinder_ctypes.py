@@ -0,0 +1,131 @@
+"""
+@file _pathfinder_ctypes.py
+@brief Загрузчик C-реализации алгоритма Дейкстры через ctypes.
+
+@details
+Компилирует _pathfinder.c в разделяемую библиотеку (один раз, при первом
+обращении) и предоставляет обертку dijkstra_csr, работающую с графом в
+формате CSR. Если компилятор недоступен или сборка не удалась, модуль
+сообщает об этом через is_available(), и вызывающий код использует
+реализацию на чистом Python.
+"""
+
+import ctypes
+import os
+import subprocess
+
+import numpy as np
+
+# Пути к исходному файлу и собранной библиотеке
+_SOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_pathfinder.c')
+_LIBRARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_pathfinder.so')
+
+# Загруженная библиотека (None - еще не загружали, False - загрузка не удалась)
+_lib = None
+
+
+def _build_library():
+    """
+    Компилирует _pathfinder.c в разделяемую библиотеку.
+
+    Returns:
+        bool: True, если сборка прошла успешно, иначе False.
+    """
+    for compiler in ('cc', 'gcc', 'clang'):
+        try:
+            result = subprocess.run(
+                [compiler, '-O3', '-march=native', '-shared', '-fPIC',
+                 '-o', _LIBRARY_PATH, _SOURCE_PATH],
+                capture_output=True,
+                check=False
+            )
+        except OSError:
+            continue
+        if result.returncode == 0:
+            return True
+    return False
+
+
+def _load():
+    """
+    Загружает (при необходимости собирая) разделяемую библиотеку.
+
+    Returns:
+        Объект ctypes.CDLL или None, если библиотека недоступна.
+    """
+    global _lib
+
+    if _lib is not None:
+        return _lib or None
+
+    # Пересобираем, если библиотеки нет или исходник новее
+    needs_build = (not os.path.exists(_LIBRARY_PATH) or
+                   os.path.getmtime(_LIBRARY_PATH) < os.path.getmtime(_SOURCE_PATH))
+
+    if needs_build and not _build_library():
+        _lib = False
+        return None
+
+    try:
+        lib = ctypes.CDLL(_LIBRARY_PATH)
+    except OSError:
+        _lib = False
+        return None
+
+    i32_p = np.ctypeslib.ndpointer(dtype=np.int32, flags='C_CONTIGUOUS')
+    f32_p = np.ctypeslib.ndpointer(dtype=np.float32, flags='C_CONTIGUOUS')
+
+    lib.dijkstra.argtypes = [
+        i32_p,           # indptr
+        i32_p,           # indices
+        f32_p,           # weights
+        ctypes.c_int32,  # n
+        ctypes.c_int32,  # src
+        ctypes.c_int32,  # dst
+        f32_p,           # cost_out
+        i32_p,           # came_from_out
+    ]
+    lib.dijkstra.restype = None
+
+    _lib = lib
+    return lib
+
+
+def is_available():
+    """
+    Проверяет, доступна ли C-реализация.
+
+    Returns:
+        bool: True, если библиотека собрана и загружена.
+    """
+    return _load() is not None
+
+
+def dijkstra_csr(indptr, indices, weights, src, dst):
+    """
+    Запускает C-реализацию алгоритма Дейкстры на графе в формате CSR.
+
+    Args:
+        indptr (np.ndarray): Массив int32 границ списков смежности (n+1 элементов).
+        indices (np.ndarray): Массив int32 номеров соседних вершин.
+        weights (np.ndarray): Массив float32 весов ребер.
+        src (int): Номер начальной вершины.
+        dst (int): Номер конечной вершины.
+
+    Returns:
+        tuple: (cost, came_from) - массивы float32 и int32 длины n
+               с дистанциями и предшественниками (-1, если вершина не достигнута).
+    """
+    lib = _load()
+    if lib is None:
+        raise RuntimeError("C-реализация алгоритма Дейкстры недоступна")
+
+    n = len(indptr) - 1
+    cost_out = np.empty(n, dtype=np.float32)
+    came_from_out = np.empty(n, dtype=np.int32)
+
+    lib.dijkstra(indptr, indices, weights,
+                 np.int32(n), np.int32(src), np.int32(dst),
+                 cost_out, came_from_out)
+
+    return cost_out, came_from_out
@@ -0,0 +1,140 @@
+"""
+@file heap4.py
+@brief 4-арная неявная куча минимума на плоском списке.
+
+@details
+Замена heapq для нагрузок Дейкстры с большим числом извлечений минимума:
+родитель элемента i находится в (i - 1) // 4, дети - в 4*i + 1 .. 4*i + 4.
+Вчетверо больший коэффициент ветвления вдвое уменьшает глубину кучи, а
+четыре ребенка лежат в соседних ячейках списка, поэтому просеивание вниз
+читает меньше кэш-линий, чем у двоичной кучи. Элементы - любые
+сравнимые значения (кортежи, упакованные целые ключи); уменьшение ключа
+не поддерживается - вызывающий код использует ленивое удаление.
+"""
+
+
+def push(heap, item):
+    """
+    Добавляет элемент в кучу с просеиванием вверх.
+
+    @param heap: список, поддерживаемый как 4-арная куча
+    @param item: добавляемое сравнимое значение
+    """
+    heap.append(item)
+    pos = len(heap) - 1
+    while pos > 0:
+        parent = (pos - 1) >> 2
+        if item < heap[parent]:
+            heap[pos] = heap[parent]
+            pos = parent
+        else:
+            break
+    heap[pos] = item
+
+
+def push_into(heap, size, item):
+    """
+    Добавляет элемент в кучу, занимающую префикс списка-буфера.
+
+    @details
+    Вариант push для переиспользуемого буфера: кучей считается срез
+    heap[:size], новый элемент пишется в ячейку heap[size] вместо
+    append, так что после первого прогрева буфер больше не растет и
+    список не перевыделяется между запусками поиска.
+
+    @param heap: список-буфер, префикс которого - 4-арная куча
+    @param size: текущее число элементов кучи
+    @param item: добавляемое сравнимое значение
+    @return новое число элементов кучи
+    """
+    if size == len(heap):
+        heap.append(item)
+    pos = size
+    size += 1
+    while pos > 0:
+        parent = (pos - 1) >> 2
+        if item < heap[parent]:
+            heap[pos] = heap[parent]
+            pos = parent
+        else:
+            break
+    heap[pos] = item
+    return size
+
+
+def pop_from(heap, size):
+    """
+    Извлекает минимальный элемент кучи, занимающей префикс списка-буфера.
+
+    @details
+    Освободившаяся ячейка остается в буфере и переиспользуется
+    последующими push_into; сам список никогда не укорачивается.
+
+    @param heap: список-буфер с непустой кучей в префиксе
+    @param size: текущее число элементов кучи
+    @return кортеж (минимальный элемент, новое число элементов)
+    """
+    size -= 1
+    last = heap[size]
+    if size == 0:
+        return last, 0
+
+    item = heap[0]
+    pos = 0
+    while True:
+        child = (pos << 2) + 1
+        if child >= size:
+            break
+        best = heap[child]
+        stop = child + 4
+        if stop > size:
+            stop = size
+        for k in range(child + 1, stop):
+            if heap[k] < best:
+                best = heap[k]
+                child = k
+        if best < last:
+            heap[pos] = best
+            pos = child
+        else:
+            break
+    heap[pos] = last
+
+    return item, size
+
+
+def pop(heap):
+    """
+    Извлекает минимальный элемент кучи с просеиванием вниз.
+
+    @param heap: непустой список, поддерживаемый как 4-арная куча
+    @return минимальный элемент
+    """
+    last = heap.pop()
+    if not heap:
+        return last
+
+    item = heap[0]
+    size = len(heap)
+    pos = 0
+    while True:
+        child = (pos << 2) + 1
+        if child >= size:
+            break
+        # Минимальный из (до) четырех детей, лежащих подряд
+        best = heap[child]
+        stop = child + 4
+        if stop > size:
+            stop = size
+        for k in range(child + 1, stop):
+            if heap[k] < best:
+                best = heap[k]
+                child = k
+        if best < last:
+            heap[pos] = best
+            pos = child
+        else:
+            break
+    heap[pos] = last
+
+    return item
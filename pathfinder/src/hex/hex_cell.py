@@ -8,6 +8,11 @@
 расстояний и соседних ячеек.
 """
 
+# Смещения шести соседних гексов в кубических координатах (dq, dr);
+# вынесены на уровень модуля, чтобы не пересоздавать кортежи при каждом
+# вызове get_neighbors
+_HEX_OFFSETS = ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1))
+
 
 class HexCell:
     """
@@ -18,7 +23,11 @@ class HexCell:
     где q + r + s = 0. Каждая ячейка имеет тип местности, который влияет на стоимость
     передвижения через нее.
     """
-    
+
+    # Ячейки создаются по одной на гекс карты, поэтому храним атрибуты
+    # в слотах: меньше памяти и быстрее доступ в горячем цикле A*
+    __slots__ = ('q', 'r', 's', 'terrain_type', '_hash')
+
     def __init__(self, q, r, terrain_type):
         """
         Инициализирует гексагональную ячейку с заданными координатами и типом местности.
@@ -32,6 +41,11 @@ class HexCell:
         # s-координата вычисляется из q и r (т.к. q + r + s = 0)
         self.s = -q - r
         self.terrain_type = terrain_type
+        # Предвычисленный хеш по координатам (константы пространственного
+        # хеширования Тешнера): ячейки хешируются при каждой операции с
+        # открытым/закрытым множеством A*, и построение кортежа в
+        # __hash__ стоило бы аллокации на каждый вызов
+        self._hash = (q * 73856093) ^ (r * 19349663)
         
     def __eq__(self, other):
         """
@@ -40,9 +54,12 @@ class HexCell:
         @param other: другая гексагональная ячейка
         @return: True, если ячейки имеют одинаковые координаты
         """
-        if not isinstance(other, HexCell):
-            return False
-        return self.q == other.q and self.r == other.r
+        # Прямое сравнение атрибутов без isinstance: сравнение с
+        # посторонним объектом - редкий случай, обрабатываемый исключением
+        try:
+            return self.q == other.q and self.r == other.r
+        except AttributeError:
+            return NotImplemented
     
     def __hash__(self):
         """
@@ -50,7 +67,7 @@ class HexCell:
         
         @return: хеш ячейки
         """
-        return hash((self.q, self.r))
+        return self._hash
     
     def __str__(self):
         """
@@ -69,11 +86,13 @@ class HexCell:
         @param other: другая гексагональная ячейка
         @return: расстояние между ячейками в гексах
         """
-        return max(
-            abs(self.q - other.q),
-            abs(self.r - other.r),
-            abs(self.s - other.s)
-        )
+        # Целочисленная форма гексагонального расстояния:
+        # max(|dq|, |dr|, |ds|) == (|dq| + |dr| + |dq + dr|) // 2,
+        # на одно вычитание и один max короче - важно, так как это
+        # эвристика A*, вызываемая на каждой релаксации
+        dq = self.q - other.q
+        dr = self.r - other.r
+        return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
     
     def get_neighbors(self):
         """
@@ -81,14 +100,5 @@ class HexCell:
         
         @return: список кортежей (q, r) для всех соседних гексов
         """
-        # Смещения для соседних гексов в кубических координатах
-        directions = [
-            (1, 0), (1, -1), (0, -1),
-            (-1, 0), (-1, 1), (0, 1)
-        ]
-        
-        neighbors = []
-        for dir_q, dir_r in directions:
-            neighbors.append((self.q + dir_q, self.r + dir_r))
-        
-        return neighbors 
\ No newline at end of file
+        q, r = self.q, self.r
+        return [(q + dq, r + dr) for dq, dr in _HEX_OFFSETS] 
\ No newline at end of file
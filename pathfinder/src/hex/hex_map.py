@@ -12,7 +12,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.patches import RegularPolygon
 
-from .hex_cell import HexCell
+from .hex_cell import HexCell, _HEX_OFFSETS
 from .hex_terrain_type import HexTerrainType
 
 
@@ -24,7 +24,9 @@ class HexMap:
     Карта состоит из гексагональных ячеек, каждая из которых имеет тип местности.
     Используется кубическая система координат (q, r, s) для представления гексов.
     """
-    
+
+    __slots__ = ('cells', 'start', 'end', '_dense_cache', '_nbr_cache')
+
     def __init__(self):
         """
         Инициализирует пустую гексагональную карту.
@@ -34,6 +36,12 @@ class HexMap:
         # Точки старта и финиша (если определены)
         self.start = None
         self.end = None
+        # Кэш плотных сеток стоимостей по классам рас (см. _materialize)
+        self._dense_cache = {}
+        # Кэш списков соседей по координатам ячейки; карта статична во
+        # время поиска, поэтому шесть словарных обращений на ячейку
+        # выполняются лишь один раз за все время жизни карты
+        self._nbr_cache = {}
     
     def add_cell(self, q, r, terrain_type):
         """
@@ -54,7 +62,11 @@ class HexMap:
             self.start = cell
         elif terrain_type == HexTerrainType.END:
             self.end = cell
-            
+
+        # Плотные сетки и списки соседей построены по старому набору ячеек
+        self._dense_cache.clear()
+        self._nbr_cache.clear()
+
         return cell
     
     def get_cell(self, q, r):
@@ -74,27 +86,70 @@ class HexMap:
         @param cell: ячейка, для которой ищем соседей
         @return: список соседних ячеек HexCell
         """
-        neighbor_coords = cell.get_neighbors()
-        neighbors = []
-        
-        for q, r in neighbor_coords:
-            neighbor = self.get_cell(q, r)
-            if neighbor:
-                neighbors.append(neighbor)
-                
+        key = (cell.q, cell.r)
+        neighbors = self._nbr_cache.get(key)
+        if neighbors is None:
+            # Обходим смещения напрямую, без промежуточного списка координат
+            cells_get = self.cells.get
+            q, r = key
+            neighbors = [neighbor for neighbor in
+                         (cells_get((q + dq, r + dr)) for dq, dr in _HEX_OFFSETS)
+                         if neighbor is not None]
+            self._nbr_cache[key] = neighbors
         return neighbors
     
-    def find_path(self, start, end, race):
+    def _materialize(self, race):
         """
-        Находит путь от начальной до конечной точки с учетом расовых модификаторов.
+        Строит плотное представление карты для заданной расы.
+        
+        @details
+        Словарь ячеек разворачивается в двумерный массив стоимостей
+        передвижения float32 по ограничивающему прямоугольнику карты;
+        отсутствующие ячейки получают бесконечную стоимость. Поиск пути
+        по такому массиву обходится без хеширования координат на каждом
+        расширении вершины. Результат кэшируется по классу расы и
+        сбрасывается при добавлении ячеек.
         
+        @param race: объект Race, задающий модификаторы передвижения
+        @return: кортеж (cost, admissible, qmin, rmin), где cost - массив
+                 (H, W), admissible - булева маска проходимых для расы
+                 ячеек, а (qmin, rmin) - смещение координат: ячейка
+                 (q, r) лежит в cost[r - rmin, q - qmin]
+        """
+        key = type(race)
+        dense = self._dense_cache.get(key)
+        if dense is not None:
+            return dense
+
+        qmin = min(q for q, _ in self.cells)
+        rmin = min(r for _, r in self.cells)
+        height = max(r for _, r in self.cells) - rmin + 1
+        width = max(q for q, _ in self.cells) - qmin + 1
+
+        cost = np.full((height, width), np.inf, dtype=np.float32)
+        for (q, r), cell in self.cells.items():
+            cost[r - rmin, q - qmin] = race.get_movement_cost(cell.terrain_type)
+
+        # Маска проходимости для расы: внутренним циклам достаточно
+        # одного булева чтения вместо сравнения с бесконечностью
+        admissible = np.isfinite(cost)
+
+        dense = (cost, admissible, qmin, rmin)
+        self._dense_cache[key] = dense
+        return dense
+
+    def find_path(self, start, end, race, bidirectional=None):
+        """
+        Находит путь от начальной до конечной точки с учетом расовых модификаторов.
+
         @param start: начальная ячейка
         @param end: конечная ячейка
         @param race: объект Race, представляющий расу с модификаторами передвижения
+        @param bidirectional: True - двунаправленный поиск; None - выбор по размеру карты
         @return: (путь, общая стоимость) или (None, float('inf')), если путь не найден
         """
         from src.pathfinding.hex_a_star import find_path
-        return find_path(self, start, end, race)
+        return find_path(self, start, end, race, bidirectional=bidirectional)
     
     def visualize(self, path=None, figsize=(10, 8)):
         """
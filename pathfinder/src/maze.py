@@ -5,6 +5,9 @@
 и выполнения операций над ним.
 """
 
+import numpy as np
+
+
 class Maze:
     """
     Класс для представления лабиринта.
@@ -15,7 +18,9 @@ class Maze:
     - '1', '2', '3', ...: герои (начальные точки)
     - 'F': конечная точка
     """
-    
+
+    __slots__ = ('grid', 'height', 'width', '_walls', 'heroes', 'end')
+
     def __init__(self, grid=None):
         """
         Инициализация лабиринта.
@@ -38,6 +43,19 @@ class Maze:
         
         self.height = len(self.grid)
         self.width = len(self.grid[0]) if self.height > 0 else 0
+
+        # Булева маска стен: проверки позиций и выбор свободных клеток
+        # становятся обращениями к массиву вместо сравнения объектов
+        if self.height > 0:
+            # Строки-строки (как в TerrainMaze) разворачиваем посимвольно,
+            # чтобы маска всегда была двумерной
+            if isinstance(self.grid[0], str):
+                cells = np.array([list(row) for row in self.grid], dtype=object)
+            else:
+                cells = np.array(self.grid, dtype=object)
+            self._walls = cells == 1
+        else:
+            self._walls = np.zeros((0, 0), dtype=bool)
         
         # Находим героев и конечную точку
         self.heroes = {}  # словарь {идентификатор: позиция}
@@ -63,8 +81,7 @@ class Maze:
         """
         row, col = position
         if 0 <= row < self.height and 0 <= col < self.width:
-            cell = self.grid[row][col]
-            return cell != 1  # Не стена
+            return not self._walls[row, col]  # Не стена
         return False
     
     def get_neighbors(self, position):
@@ -113,7 +130,9 @@ class Maze:
         Returns:
             dict: Словарь {идентификатор: позиция} для всех героев.
         """
-        return self.heroes
+        # Позиции вычислены один раз при создании лабиринта; наружу
+        # отдается копия, чтобы вызывающий код не испортил кэш
+        return dict(self.heroes)
     
     def get_all_valid_positions(self):
         """
@@ -122,12 +141,9 @@ class Maze:
         Returns:
             list: Список кортежей (row, col), представляющих все допустимые позиции.
         """
-        valid_positions = []
-        for i in range(self.height):
-            for j in range(self.width):
-                if self.is_valid_position((i, j)):
-                    valid_positions.append((i, j))
-        return valid_positions
+        # Одна векторная выборка вместо обхода всей сетки в Python
+        rows, cols = np.where(~self._walls)
+        return list(zip(rows.tolist(), cols.tolist()))
     
     def __str__(self):
         """
@@ -16,7 +16,19 @@
 @date 2025-03-10
 """
 
-from collections import deque
+import numpy as np
+
+# Смещения четырех соседей клетки: вверх, вниз, влево, вправо
+_BFS_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# Перевод шага (dr, dc) в название направления: одна табличная выборка
+# вместо цепочки сравнений на каждый шаг пути
+_DIR_NAMES = {
+    (-1, 0): 'вверх',
+    (1, 0): 'вниз',
+    (0, -1): 'влево',
+    (0, 1): 'вправо',
+}
 
 
 class PathFinder:
@@ -31,7 +43,9 @@ class PathFinder:
     
     @see maze.Maze
     """
-    
+
+    __slots__ = ('maze',)
+
     def __init__(self, maze):
         """
         @brief Инициализация объекта PathFinder.
@@ -86,31 +100,69 @@ class PathFinder:
         if start is None or end is None:
             return None
         
-        # Очередь для BFS
-        queue = deque([start])
-        # Словарь для отслеживания предыдущего шага
-        visited = {start: None}
-        
-        while queue:
-            current = queue.popleft()
-            
-            # Если достигли конечной точки
-            if current == end:
-                # Восстанавливаем путь
-                path = []
-                while current:
-                    path.append(current)
-                    current = visited[current]
-                return path[::-1]  # Переворачиваем путь
-            
-            # Обрабатываем соседей
-            for neighbor in self.maze.get_neighbors(current):
-                if neighbor not in visited:
-                    queue.append(neighbor)
-                    visited[neighbor] = current
-        
-        # Если путь не найден
-        return None
+        # Вместо очереди клеток фронт волны хранится булевой маской и
+        # расширяется на все четыре направления сразу: каждая волна BFS -
+        # несколько векторных операций, без кортежей и deque на клетку.
+        # Маска непроходимых клеток берется из правил самого лабиринта:
+        # у TerrainMaze это проходимость местности, у базового Maze -
+        # предвычисленная маска стен, для прочих лабиринтов - опрос
+        # is_valid_position по клеткам
+        passable = getattr(self.maze, '_passable', None)
+        if passable is not None:
+            walls = ~np.asarray(passable, dtype=bool)
+        else:
+            walls = getattr(self.maze, '_walls', None)
+            if walls is None:
+                walls = np.array(
+                    [[not self.maze.is_valid_position((i, j))
+                      for j in range(self.maze.width)]
+                     for i in range(self.maze.height)], dtype=bool)
+            else:
+                walls = np.asarray(walls, dtype=bool)
+        height, width = walls.shape
+
+        visited = np.zeros((height, width), dtype=bool)
+        # Код направления (индекс в _BFS_OFFSETS), которым волна пришла
+        # в клетку; -1 - клетка еще не достигнута
+        parent_dir = np.full((height, width), -1, dtype=np.int8)
+
+        frontier = np.zeros((height, width), dtype=bool)
+        frontier[start] = True
+        visited[start] = True
+
+        while frontier.any() and not visited[end]:
+            new_frontier = np.zeros((height, width), dtype=bool)
+            for direction, (dr, dc) in enumerate(_BFS_OFFSETS):
+                # Клетки, достижимые из фронта шагом (dr, dc)
+                shifted = np.zeros((height, width), dtype=bool)
+                if dr == -1:
+                    shifted[:-1, :] = frontier[1:, :]
+                elif dr == 1:
+                    shifted[1:, :] = frontier[:-1, :]
+                elif dc == -1:
+                    shifted[:, :-1] = frontier[:, 1:]
+                else:
+                    shifted[:, 1:] = frontier[:, :-1]
+
+                reached = shifted & ~walls & ~visited & ~new_frontier
+                parent_dir[reached] = direction
+                new_frontier |= reached
+
+            visited |= new_frontier
+            frontier = new_frontier
+
+        if not visited[end]:
+            # Если путь не найден
+            return None
+
+        # Восстанавливаем путь обратным ходом по кодам направлений
+        path = [end]
+        current = end
+        while current != start:
+            dr, dc = _BFS_OFFSETS[parent_dir[current]]
+            current = (current[0] - dr, current[1] - dc)
+            path.append(current)
+        return path[::-1]  # Переворачиваем путь
     
     def get_path_directions(self, path):
         """
@@ -124,19 +176,6 @@ class PathFinder:
         """
         if not path or len(path) < 2:
             return []
-        
-        directions = []
-        for i in range(1, len(path)):
-            prev_row, prev_col = path[i-1]
-            curr_row, curr_col = path[i]
-            
-            if curr_row < prev_row:
-                directions.append('вверх')
-            elif curr_row > prev_row:
-                directions.append('вниз')
-            elif curr_col < prev_col:
-                directions.append('влево')
-            elif curr_col > prev_col:
-                directions.append('вправо')
-        
-        return directions 
\ No newline at end of file
+
+        return [_DIR_NAMES[(curr[0] - prev[0], curr[1] - prev[1])]
+                for prev, curr in zip(path, path[1:])] 
\ No newline at end of file
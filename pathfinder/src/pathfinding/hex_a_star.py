@@ -5,83 +5,406 @@
 @details
 Этот модуль содержит реализацию алгоритма A* для поиска оптимального
 пути на гексагональной карте с учетом расовых модификаторов стоимости
-передвижения по разным типам местности.
+передвижения по разным типам местности. Карта предварительно
+разворачивается в плотный массив стоимостей (HexMap._materialize),
+поэтому внутренний цикл работает с целочисленными индексами ячеек,
+а не с хешированием объектов HexCell.
 """
 
 import heapq
 
+import numpy as np
 
-def find_path(hex_map, start, end, race):
+try:
+    from .hex_a_star_numba import astar as _astar_numba
+except ImportError:
+    # numba не установлена - остается чистая Python-реализация ниже
+    _astar_numba = None
+
+# Смещения шести соседних гексов в осевых координатах (dq, dr)
+_HEX_DIRECTIONS = ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1))
+
+# С этого числа ячеек двунаправленный поиск включается автоматически:
+# на маленьких картах выигрыш не окупает второй комплект структур
+_BIDIRECTIONAL_MIN_CELLS = 10000
+
+
+def _find_path_bidirectional(hex_map, flat_cost, flat_adm, height, width,
+                             qmin, rmin, start, start_idx, end_idx):
+    """
+    Двунаправленный поиск кратчайшего пути от обеих конечных точек.
+
+    @details
+    Две волны Дейкстры идут навстречу друг другу: прямая от start и
+    обратная от end, каждая со своими массивами g-оценок и
+    предшественников. На каждом шаге расширяется фронт с меньшей
+    верхушкой кучи; поиск завершается, когда сумма верхушек достигает
+    лучшей найденной стоимости встречи. На открытых картах каждая волна
+    обходит примерно вдвое меньше ячеек, чем один поиск из start.
+
+    Стоимость входа в ячейку учитывается при входе, поэтому обратная
+    релаксация платит за ячейку, из которой волна пришла; эвристика
+    здесь не используется - для двунаправленного A* потребовались бы
+    согласованные встречные потенциалы.
+
+    @return: кортеж (путь, стоимость) либо (None, float('inf'))
+    """
+    n = height * width
+    inf = float('inf')
+
+    g_f = np.full(n, np.inf)
+    g_b = np.full(n, np.inf)
+    came_f = np.full(n, -1, dtype=np.int32)
+    came_b = np.full(n, -1, dtype=np.int32)
+    closed_f = np.zeros(n, dtype=bool)
+    closed_b = np.zeros(n, dtype=bool)
+
+    g_f[start_idx] = 0.0
+    g_b[end_idx] = 0.0
+    open_f = [(0.0, start_idx)]
+    open_b = [(0.0, end_idx)]
+
+    # Лучшая найденная стоимость сквозного пути и вершина встречи
+    mu = inf
+    meet = -1
+
+    while open_f and open_b:
+        # Поиск можно останавливать, как только даже сумма минимальных
+        # верхушек обеих куч не способна улучшить найденную встречу
+        if open_f[0][0] + open_b[0][0] >= mu:
+            break
+
+        # Расширяем фронт с меньшей верхушкой
+        forward = open_f[0][0] <= open_b[0][0]
+        open_set = open_f if forward else open_b
+        closed_set = closed_f if forward else closed_b
+        g_own = g_f if forward else g_b
+        g_other = g_b if forward else g_f
+        came = came_f if forward else came_b
+
+        _, current = heapq.heappop(open_set)
+        if closed_set[current]:
+            continue
+        closed_set[current] = True
+
+        current_q = qmin + current % width
+        current_r = rmin + current // width
+        g_current = g_own[current]
+        # Обратная волна платит за ячейку, из которой делает шаг
+        step_cost = float(flat_cost[current]) if not forward else 0.0
+
+        for dq, dr in _HEX_DIRECTIONS:
+            ni = current_r + dr - rmin
+            nj = current_q + dq - qmin
+            if ni < 0 or ni >= height or nj < 0 or nj >= width:
+                continue
+
+            neighbor_idx = ni * width + nj
+            if closed_set[neighbor_idx]:
+                continue
+
+            if forward:
+                if not flat_adm[neighbor_idx]:
+                    continue
+                tentative = g_current + float(flat_cost[neighbor_idx])
+            else:
+                # Стоимость входа в start никогда не оплачивается
+                if not flat_adm[neighbor_idx] and neighbor_idx != start_idx:
+                    continue
+                tentative = g_current + step_cost
+
+            if tentative < g_own[neighbor_idx]:
+                g_own[neighbor_idx] = tentative
+                came[neighbor_idx] = current
+                heapq.heappush(open_set, (tentative, neighbor_idx))
+
+            # Волны встретились: проверяем стоимость сквозного пути через
+            # эту ячейку даже без улучшения, потому что оценка встречной
+            # волны могла понизиться после прежней релаксации
+            total = g_own[neighbor_idx] + g_other[neighbor_idx]
+            if total < mu:
+                mu = total
+                meet = neighbor_idx
+
+    if meet < 0:
+        return None, inf
+
+    # Сшиваем две цепочки предшественников в вершине встречи
+    path = []
+    idx = meet
+    while idx != start_idx:
+        path.append(hex_map.cells[(qmin + idx % width, rmin + idx // width)])
+        idx = came_f[idx]
+    path.append(start)
+    path.reverse()
+    idx = came_b[meet]
+    while idx >= 0:
+        path.append(hex_map.cells[(qmin + idx % width, rmin + idx // width)])
+        idx = came_b[idx]
+    return path, float(mu)
+
+
+def _find_path_bucket_queue(hex_map, cost10, height, width, qmin, rmin,
+                            start, start_idx, end_idx):
+    """
+    Вариант A* с корзинной очередью Диала для целочисленных весов.
+
+    @details
+    Когда все веса ребер целые и небольшие (расовые модификаторы кратны
+    0.1 и умножены на 10), приоритетную очередь можно заменить списком
+    корзин, индексируемым f-оценкой: push и pop становятся
+    амортизированно O(1) вместо O(log n) у кучи.
+
+    @param cost10: одномерный int64-массив удесятеренных стоимостей,
+                   -1 для непроходимых ячеек
+    @return: кортеж (путь, стоимость) в исходных единицах
+    """
+    end_q = qmin + end_idx % width
+    end_r = rmin + end_idx // width
+
+    # Масштаб эвристики - минимальный положительный вес ребра: оценка
+    # 10 * расстояние недопустима, когда расовые модификаторы опускают
+    # стоимость ниже 1.0, и корзинный порядок закрывал бы узлы по
+    # завышенным f-оценкам
+    positive = cost10[cost10 > 0]
+    min_step = int(positive.min()) if positive.size else 0
+
+    g_score = {start_idx: 0}
+    # Массив индексов предшественников: реконструкция пути становится
+    # плотным обходом массива вместо цепочки словарных обращений
+    came_from = np.full(height * width, -1, dtype=np.int32)
+    # Закрытые узлы - байтовый массив: проверка по индексу без хеширования
+    closed_set = np.zeros(height * width, dtype=np.bool_)
+    h_cache = {}
+
+    # Корзины, индексируемые f-оценкой, и курсор минимальной непустой
+    buckets = [[] for _ in range(min_step * start.distance(
+        hex_map.cells[(end_q, end_r)]) + 1)]
+    buckets[-1].append(start_idx)
+    cursor = 0
+
+    while True:
+        # Продвигаем курсор до первой непустой корзины
+        while cursor < len(buckets) and not buckets[cursor]:
+            cursor += 1
+        if cursor >= len(buckets):
+            break
+
+        current = buckets[cursor].pop()
+
+        if current == end_idx:
+            path = []
+            idx = end_idx
+            while idx != start_idx:
+                path.append(hex_map.cells[(qmin + idx % width,
+                                           rmin + idx // width)])
+                idx = came_from[idx]
+            path.append(start)
+            path.reverse()
+            return path, g_score[end_idx] / 10.0
+
+        # Пропускаем устаревшие записи (ленивое удаление)
+        if closed_set[current]:
+            continue
+        closed_set[current] = True
+
+        current_q = qmin + current % width
+        current_r = rmin + current // width
+        g_current = g_score[current]
+
+        for dq, dr in _HEX_DIRECTIONS:
+            ni = current_r + dr - rmin
+            nj = current_q + dq - qmin
+            if ni < 0 or ni >= height or nj < 0 or nj >= width:
+                continue
+
+            neighbor_idx = ni * width + nj
+            if closed_set[neighbor_idx]:
+                continue
+
+            movement_cost = cost10[neighbor_idx]
+            if movement_cost < 0:
+                continue
+
+            tentative_g_score = g_current + movement_cost
+            previous_g = g_score.get(neighbor_idx)
+            if previous_g is not None and tentative_g_score >= previous_g:
+                continue
+
+            came_from[neighbor_idx] = current
+            g_score[neighbor_idx] = tentative_g_score
+
+            h_value = h_cache.get(neighbor_idx)
+            if h_value is None:
+                hq = (qmin + nj) - end_q
+                hr = (rmin + ni) - end_r
+                h_value = min_step * ((abs(hq) + abs(hr) + abs(hq + hr)) // 2)
+                h_cache[neighbor_idx] = h_value
+
+            f_value = tentative_g_score + h_value
+            while len(buckets) <= f_value:
+                buckets.append([])
+            buckets[f_value].append(neighbor_idx)
+            if f_value < cursor:
+                cursor = f_value
+
+    # Путь не найден
+    return None, float('inf')
+
+
+def find_path(hex_map, start, end, race, bidirectional=None):
     """
     Находит оптимальный путь от начальной до конечной точки на гексагональной карте
     с учетом расовых модификаторов.
-    
+
     @param hex_map: гексагональная карта (объект HexMap)
     @param start: начальная ячейка (объект HexCell)
     @param end: конечная ячейка (объект HexCell)
     @param race: раса, определяющая модификаторы движения (объект Race)
+    @param bidirectional: True - искать двумя встречными волнами; None -
+                          включать автоматически на крупных картах, когда
+                          недоступно скомпилированное ядро
     @return: кортеж (путь, стоимость), где путь - список объектов HexCell от start до end,
              стоимость - общая стоимость пути. Если путь не найден, возвращает (None, float('inf'))
     """
-    # Приоритетная очередь для открытых узлов (f_score, node)
-    open_set = []
-    # Словарь для хранения g_score для каждого узла
-    g_score = {start: 0}
-    # Словарь для хранения f_score для каждого узла
-    f_score = {start: start.distance(end)}
-    # Словарь для обратного пути
-    came_from = {}
-    # Множество закрытых узлов
-    closed_set = set()
-    
-    # Добавляем начальную точку в открытый список
-    heapq.heappush(open_set, (f_score[start], id(start), start))
-    
+    # Плотная сетка стоимостей и маска проходимости для этой расы
+    # (кэшируются картой)
+    cost, admissible, qmin, rmin = hex_map._materialize(race)
+    height, width = cost.shape
+    flat_cost = cost.ravel()
+    flat_adm = admissible.ravel()
+
+    start_idx = (start.r - rmin) * width + (start.q - qmin)
+    end_idx = (end.r - rmin) * width + (end.q - qmin)
+    end_q, end_r = end.q, end.r
+
+    if start_idx == end_idx:
+        return [start], 0.0
+
+    # Недостижимая для расы цель отсекается без запуска поиска
+    if not flat_adm[end_idx]:
+        return None, float('inf')
+
+    if bidirectional is None:
+        bidirectional = (_astar_numba is None
+                         and height * width >= _BIDIRECTIONAL_MIN_CELLS)
+    if bidirectional:
+        return _find_path_bidirectional(hex_map, flat_cost, flat_adm, height,
+                                        width, qmin, rmin, start, start_idx,
+                                        end_idx)
+
+    # Скомпилированное ядро выполняет весь цикл вне интерпретатора
+    if _astar_numba is not None:
+        came, total_cost = _astar_numba(flat_cost, height, width,
+                                        start_idx, end_idx)
+        if total_cost == float('inf'):
+            return None, float('inf')
+        path = []
+        idx = end_idx
+        while idx != start_idx:
+            path.append(hex_map.cells[(qmin + idx % width,
+                                       rmin + idx // width)])
+            idx = came[idx]
+        path.append(start)
+        path.reverse()
+        return path, float(total_cost)
+
+    # Веса рас кратны 0.1: после умножения на 10 они целые, и вместо
+    # кучи можно использовать корзинную очередь Диала. Неквантуемые
+    # веса идут по классическому пути с heapq ниже.
+    scaled = np.where(np.isfinite(flat_cost), flat_cost * 10.0, -1.0)
+    rounded = np.rint(scaled)
+    if bool(np.all(np.abs(scaled - rounded) < 1e-4)):
+        cost10 = rounded.astype(np.int64)
+        return _find_path_bucket_queue(hex_map, cost10, height, width,
+                                       qmin, rmin, start, start_idx, end_idx)
+
+    # Масштаб эвристики - минимальный положительный вес ребра, как и в
+    # корзинном варианте: расстояние в целых гексах завышает остаток
+    # пути, когда расовые модификаторы опускают стоимость шага ниже 1.0
+    positive = flat_cost[np.isfinite(flat_cost) & (flat_cost > 0)]
+    min_step = float(positive.min()) if positive.size else 0.0
+
+    # Оценки стоимости, ключ - плоский индекс ячейки; предшественники
+    # хранятся плотным int32-массивом (-1 - ячейка не достигнута)
+    g_score = {start_idx: 0.0}
+    came_from = np.full(height * width, -1, dtype=np.int32)
+    # Закрытые узлы - байтовый массив, индексируемый плоским номером ячейки
+    closed_set = np.zeros(height * width, dtype=np.bool_)
+    # Кэш эвристики: расстояние до цели неизменно для фиксированного end,
+    # а одна и та же ячейка релаксируется многократно
+    h_cache = {}
+
+    # Приоритетная очередь для открытых узлов (f_score, idx)
+    open_set = [(min_step * start.distance(end), start_idx)]
+
     while open_set:
         # Получаем узел с наименьшей f-оценкой
-        _, _, current = heapq.heappop(open_set)
-        
+        _, current = heapq.heappop(open_set)
+
         # Если достигли конечной точки
-        if current == end:
-            # Восстанавливаем путь
+        if current == end_idx:
+            # Восстанавливаем путь, превращая индексы обратно в ячейки
             path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
+            idx = end_idx
+            while idx != start_idx:
+                path.append(hex_map.cells[(qmin + idx % width,
+                                           rmin + idx // width)])
+                idx = came_from[idx]
             path.append(start)
             path.reverse()
-            return path, g_score[end]
-        
+            return path, g_score[end_idx]
+
+        # Пропускаем устаревшие записи очереди (ленивое удаление)
+        if closed_set[current]:
+            continue
+
         # Добавляем текущий узел в закрытый список
-        closed_set.add(current)
-        
-        # Обрабатываем всех соседей
-        for neighbor in hex_map.get_neighbors(current):
+        closed_set[current] = True
+
+        current_q = qmin + current % width
+        current_r = rmin + current // width
+        g_current = g_score[current]
+
+        # Обрабатываем всех соседей по шести осевым смещениям
+        for dq, dr in _HEX_DIRECTIONS:
+            ni = current_r + dr - rmin
+            nj = current_q + dq - qmin
+            if ni < 0 or ni >= height or nj < 0 or nj >= width:
+                continue
+
+            neighbor_idx = ni * width + nj
+
             # Если сосед уже обработан
-            if neighbor in closed_set:
+            if closed_set[neighbor_idx]:
                 continue
-            
-            # Получаем стоимость перехода к этому соседу с учетом расы
-            movement_cost = race.get_movement_cost(neighbor.terrain_type)
-            
-            # Если местность непроходима для этой расы
-            if movement_cost == float('inf'):
+
+            # Непроходимые (или отсутствующие на карте) ячейки отсекаются
+            # одним булевым чтением до обращения к стоимости
+            if not flat_adm[neighbor_idx]:
                 continue
-            
+
             # Вычисляем новую g-оценку
-            tentative_g_score = g_score[current] + movement_cost
-            
+            tentative_g_score = g_current + float(flat_cost[neighbor_idx])
+
             # Если сосед уже есть в открытом списке и новый путь не лучше
-            if neighbor in g_score and tentative_g_score >= g_score[neighbor]:
+            previous_g = g_score.get(neighbor_idx)
+            if previous_g is not None and tentative_g_score >= previous_g:
                 continue
-            
+
             # Найден лучший путь к соседу
-            came_from[neighbor] = current
-            g_score[neighbor] = tentative_g_score
-            f_score[neighbor] = tentative_g_score + neighbor.distance(end)
-            
+            came_from[neighbor_idx] = current
+            g_score[neighbor_idx] = tentative_g_score
+
+            h_value = h_cache.get(neighbor_idx)
+            if h_value is None:
+                hq = (qmin + nj) - end_q
+                hr = (rmin + ni) - end_r
+                h_value = min_step * ((abs(hq) + abs(hr) + abs(hq + hr)) // 2)
+                h_cache[neighbor_idx] = h_value
+
             # Добавляем соседа в открытый список
-            heapq.heappush(open_set, (f_score[neighbor], id(neighbor), neighbor))
-    
+            heapq.heappush(open_set, (tentative_g_score + h_value, neighbor_idx))
+
     # Путь не найден
-    return None, float('inf') 
\ No newline at end of file
+    return None, float('inf')
@@ -0,0 +1,145 @@
+"""
+@file hex_a_star_numba.py
+@brief JIT-компилируемое ядро алгоритма A* для гексагональной карты.
+
+@details
+Внутренний цикл A* по плотной сетке стоимостей, скомпилированный Numba:
+двоичная куча хранится в паре массивов (f-оценка, индекс ячейки), так
+что горячий цикл целиком выполняется вне интерпретатора. Модуль
+импортируется из hex_a_star лениво; при отсутствии numba используется
+чистая Python-реализация.
+"""
+
+import numpy as np
+from numba import njit
+
+# Смещения шести соседних гексов: строка (di = dr) и столбец (dj = dq)
+_DI = np.array([0, -1, -1, 0, 1, 1], dtype=np.int64)
+_DJ = np.array([1, 1, 0, -1, -1, 0], dtype=np.int64)
+
+
+@njit(cache=True)
+def astar(flat_cost, height, width, start_idx, end_idx):
+    """
+    Выполняет поиск A* по плоскому массиву стоимостей.
+
+    @param flat_cost: одномерный float32-массив стоимостей длины height * width
+    @param height: высота плотной сетки
+    @param width: ширина плотной сетки
+    @param start_idx: плоский индекс начальной ячейки
+    @param end_idx: плоский индекс конечной ячейки
+    @return: кортеж (came, cost), где came - int32-массив индексов
+             предшественников (-1 для недостигнутых ячеек), cost -
+             стоимость пути до цели или бесконечность
+    """
+    n = height * width
+    g = np.full(n, np.inf, dtype=np.float64)
+    came = np.full(n, -1, dtype=np.int32)
+    closed = np.zeros(n, dtype=np.uint8)
+
+    end_i = end_idx // width
+    end_j = end_idx % width
+
+    # Масштаб эвристики - минимальный положительный вес ребра: оценка
+    # в целых гексах недопустима, когда расовые модификаторы опускают
+    # стоимость шага ниже 1.0
+    min_step = np.inf
+    for i in range(n):
+        c = flat_cost[i]
+        if c > 0.0 and c < min_step:
+            min_step = c
+    if min_step == np.inf:
+        min_step = 0.0
+
+    # Двоичная куча в двух параллельных массивах с ростом по мере надобности
+    heap_f = np.empty(1024, dtype=np.float64)
+    heap_v = np.empty(1024, dtype=np.int64)
+
+    g[start_idx] = 0.0
+    hq = start_idx % width - end_j
+    hr = start_idx // width - end_i
+    heap_f[0] = min_step * ((abs(hq) + abs(hr) + abs(hq + hr)) // 2)
+    heap_v[0] = start_idx
+    size = 1
+
+    while size > 0:
+        # Извлекаем вершину с минимальной f-оценкой
+        current = heap_v[0]
+        size -= 1
+        heap_f[0] = heap_f[size]
+        heap_v[0] = heap_v[size]
+        pos = 0
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap_f[child + 1] < heap_f[child]:
+                child += 1
+            if heap_f[child] < heap_f[pos]:
+                heap_f[pos], heap_f[child] = heap_f[child], heap_f[pos]
+                heap_v[pos], heap_v[child] = heap_v[child], heap_v[pos]
+                pos = child
+            else:
+                break
+
+        if current == end_idx:
+            return came, g[end_idx]
+
+        # Устаревшие записи очереди (ленивое удаление)
+        if closed[current]:
+            continue
+        closed[current] = 1
+
+        ci = current // width
+        cj = current % width
+        g_current = g[current]
+
+        for k in range(6):
+            ni = ci + _DI[k]
+            nj = cj + _DJ[k]
+            if ni < 0 or ni >= height or nj < 0 or nj >= width:
+                continue
+
+            neighbor_idx = ni * width + nj
+            if closed[neighbor_idx]:
+                continue
+
+            movement_cost = flat_cost[neighbor_idx]
+            if movement_cost == np.inf:
+                continue
+
+            tentative_g = g_current + movement_cost
+            if tentative_g >= g[neighbor_idx]:
+                continue
+
+            g[neighbor_idx] = tentative_g
+            came[neighbor_idx] = current
+
+            hq = nj - end_j
+            hr = ni - end_i
+            f_value = tentative_g + min_step * ((abs(hq) + abs(hr)
+                                                 + abs(hq + hr)) // 2)
+
+            # Вставка в кучу с просеиванием вверх
+            if size >= heap_f.shape[0]:
+                new_f = np.empty(heap_f.shape[0] * 2, dtype=np.float64)
+                new_v = np.empty(heap_v.shape[0] * 2, dtype=np.int64)
+                new_f[:size] = heap_f[:size]
+                new_v[:size] = heap_v[:size]
+                heap_f = new_f
+                heap_v = new_v
+            pos = size
+            heap_f[pos] = f_value
+            heap_v[pos] = neighbor_idx
+            size += 1
+            while pos > 0:
+                parent = (pos - 1) // 2
+                if heap_f[pos] < heap_f[parent]:
+                    heap_f[pos], heap_f[parent] = heap_f[parent], heap_f[pos]
+                    heap_v[pos], heap_v[parent] = heap_v[parent], heap_v[pos]
+                    pos = parent
+                else:
+                    break
+
+    # Путь не найден
+    return came, np.inf
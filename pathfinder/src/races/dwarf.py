@@ -22,6 +22,8 @@ class Dwarf(Race):
     но менее приспособлены к болотистой местности и густым лесам.
     """
     
+    __slots__ = ()
+
     # Имя расы
     name = "Гном"
     
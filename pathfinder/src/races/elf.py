@@ -23,6 +23,8 @@ class Elf(Race):
     и населенных пунктах других рас.
     """
     
+    __slots__ = ()
+
     # Имя расы
     name = "Эльф"
     
@@ -23,6 +23,8 @@ class Human(Race):
     к природным условиям, особенно к лесам и экстремальным средам.
     """
     
+    __slots__ = ()
+
     # Имя расы
     name = "Человек"
     
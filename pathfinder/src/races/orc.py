@@ -21,6 +21,8 @@ class Orc(Race):
     суровой местности, но менее комфортно чувствуют себя в воде и холодных регионах.
     """
     
+    __slots__ = ()
+
     # Имя расы
     name = "Орк"
     
@@ -28,6 +28,10 @@ class Race(ABC):
     типов местности, которые влияют на стоимость передвижения.
     """
     
+    # Расы - неизменяемые объекты-значения: весь статус хранится в
+    # атрибутах класса, поэтому экземплярам словарь не нужен
+    __slots__ = ()
+
     # Имя расы (должно быть переопределено в наследниках)
     name = "Базовая раса"
     
@@ -41,7 +45,41 @@ class Race(ABC):
     # Значение float('inf') означает непроходимую местность
     # Должно быть переопределено в наследниках
     terrain_modifiers = {t: 1.0 for t in HexTerrainType}
-    
+
+    # Таблица модификаторов, индексируемая HexTerrainType.value;
+    # строится лениво и отдельно для каждого класса расы
+    _cost_table = None
+
+    # Кэшированный экземпляр: расы не хранят состояния в экземпляре,
+    # поэтому каждый класс расы ведет себя как одиночка
+    _instance = None
+
+    def __new__(cls):
+        instance = cls.__dict__.get('_instance')
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instance = instance
+        return instance
+
+    @classmethod
+    def _get_cost_table(cls):
+        """
+        Возвращает кортеж модификаторов, индексируемый значением типа местности.
+
+        @return: кортеж модификаторов, где индекс - HexTerrainType.value
+        """
+        table = cls.__dict__.get('_cost_table')
+        if table is None:
+            size = 1 + max(t.value for t in HexTerrainType
+                           if isinstance(t.value, int))
+            costs = [1.0] * size
+            for t in HexTerrainType:
+                if isinstance(t.value, int):
+                    costs[t.value] = cls.terrain_modifiers.get(t, 1.0)
+            table = tuple(costs)
+            cls._cost_table = table
+        return table
+
     def get_movement_cost(self, terrain_type):
         """
         Возвращает стоимость передвижения по указанному типу местности с учетом
@@ -50,15 +88,15 @@ class Race(ABC):
         @param terrain_type: тип местности из HexTerrainType
         @return: модифицированная стоимость передвижения для данной расы
         """
-        # Получаем базовый модификатор для этого типа местности
-        modifier = self.terrain_modifiers.get(terrain_type, 1.0)
-        
-        # Если модификатор бесконечный, это означает непроходимую территорию
-        if modifier == float('inf'):
-            return float('inf')
-        
-        # Возвращаем модифицированную стоимость
-        return modifier
+        # Горячий путь A*: одно целочисленное индексирование кортежа
+        # вместо хеширования члена перечисления в словаре
+        value = getattr(terrain_type, 'value', None)
+        if type(value) is int:
+            return type(self)._get_cost_table()[value]
+
+        # Служебные члены перечисления (DESCRIPTIONS, COLORS) и прочие
+        # ключи без целочисленного значения идут через словарь
+        return self.terrain_modifiers.get(terrain_type, 1.0)
     
     def __str__(self):
         """
@@ -105,6 +143,9 @@ class Race(ABC):
         @param terrain_type: Тип местности
         @return Модификатор стоимости прохода (float)
         """
+        value = getattr(terrain_type, 'value', None)
+        if type(value) is int:
+            return cls._get_cost_table()[value]
         return cls.terrain_modifiers.get(terrain_type, 1.0)
     
     @classmethod
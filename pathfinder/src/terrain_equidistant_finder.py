@@ -9,9 +9,31 @@
 """
 
 import heapq
-from collections import defaultdict
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
 from equidistant_finder import EquidistantFinder
 
+try:
+    from _dijkstra_nb import dial_dijkstra as _dial_nb
+    from _dijkstra_nb import dijkstra as _dijkstra_nb
+    from _dijkstra_nb import multi_dijkstra as _multi_dijkstra_nb
+except ImportError:
+    # numba не установлена - остается чистая Python-реализация ниже
+    _dial_nb = None
+    _dijkstra_nb = None
+    _multi_dijkstra_nb = None
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as _csgraph_dijkstra
+except ImportError:
+    # scipy не установлена - многоисточниковый расчет идет по другим путям
+    csr_matrix = None
+    _csgraph_dijkstra = None
+
 class TerrainEquidistantFinder(EquidistantFinder):
     """
     @brief Класс для поиска оптимальной точки сбора с учетом различных типов местности.
@@ -52,71 +74,519 @@ class TerrainEquidistantFinder(EquidistantFinder):
             raise ValueError("Переданный лабиринт должен поддерживать методы для работы со стоимостью перемещения")
         
         super().__init__(maze)
-    
+
+        # Кэш несмасштабированных полей расстояний по источникам: публичные
+        # методы (поиск точки сбора, времена прибытия) многократно запрашивают
+        # поля одних и тех же героев
+        self._dist_cache = {}
+        self._dist_cache_grid = None
+
+        # Целочисленная копия квантованной сетки для карманной очереди
+        # Дайала: стоимости удвоены (масштаб i8-сетки), -1 помечает
+        # непроходимые клетки
+        quantized = getattr(maze, 'cost_grid_i8', None)
+        if quantized is not None:
+            icost = quantized.astype(np.int32).ravel()
+            icost[icost == maze.IMPASSABLE_I8] = -1
+            self._icost = icost
+        else:
+            self._icost = None
+
+        # Рабочий буфер расстояний, переживающий вызовы: ядра записывают
+        # индексы затронутых клеток, и перед следующим запуском сбрасывается
+        # только этот префикс вместо полного заполнения массива inf
+        self._scratch_dist = None
+        self._touched = None
+        self._touched_n = 0
+
+    def _scratch_buffer(self):
+        """
+        @brief Возвращает рабочий буфер расстояний, сброшенный до inf.
+
+        @details
+        Сбрасываются лишь клетки, затронутые предыдущим запуском ядра
+        (их индексы хранит массив _touched), поэтому повторные вызовы
+        обходятся без полного прохода по буферу.
+
+        @return Плоский float32-массив длины height * width, целиком inf.
+        """
+        n = self.maze.height * self.maze.width
+        dist = self._scratch_dist
+        if dist is None or dist.shape[0] != n:
+            dist = np.full(n, np.inf, dtype=np.float32)
+            self._scratch_dist = dist
+            self._touched = np.empty(n, dtype=np.int32)
+        else:
+            dist[self._touched[:self._touched_n]] = np.inf
+        self._touched_n = 0
+        return dist
+
+    def _check_dist_cache(self):
+        """
+        @brief Сбрасывает кэш полей расстояний при смене сетки стоимостей.
+
+        @details
+        Лабиринт после построения не изменяется, поэтому признаком
+        устаревания кэша служит замена самого массива стоимостей
+        (например, при подмене лабиринта сеткой другой расы).
+
+        @return Текущий массив стоимостей лабиринта.
+        """
+        cost = self._cost_array()
+        if cost is not self._dist_cache_grid:
+            self._dist_cache.clear()
+            self._dist_cache_grid = cost
+        return cost
+
+    def _dist_from(self, source):
+        """
+        @brief Возвращает поле расстояний источника, вычисляя его один раз.
+
+        @param source Кортеж (row, col) стартовой позиции.
+        @return Массив numpy (высота x ширина, float32) несмасштабированных
+                стоимостей пути; кэшированный экземпляр, изменять нельзя.
+        """
+        self._check_dist_cache()
+        field = self._dist_cache.get(source)
+        if field is None:
+            field = self._compute_distance_field(source)
+            self._dist_cache[source] = field
+        return field
+
+    def _cost_array(self):
+        """
+        @brief Возвращает плотную сетку стоимостей лабиринта.
+
+        @details
+        TerrainMaze уже хранит предвычисленную float32-сетку cost_grid;
+        для других лабиринтов с нужными методами сетка строится один раз
+        поэлементно. Непроходимые клетки представлены бесконечностью.
+
+        @return Массив numpy (высота x ширина, float32) стоимостей входа в клетку.
+        """
+        cost = getattr(self.maze, 'cost_grid', None)
+        if cost is None:
+            cost = np.array(
+                [[self.maze.get_terrain_cost((i, j))
+                  for j in range(self.maze.width)]
+                 for i in range(self.maze.height)], dtype=np.float32)
+        return cost
+
+    def _compute_distance_field(self, source):
+        """
+        @brief Вычисляет поле расстояний от одного источника.
+
+        @details
+        Алгоритм Дейкстры по плотной сетке стоимостей: расстояния и
+        признак обработанности хранятся в плоских массивах, индексируемых
+        номером клетки, а не в словарях с хешированием кортежей. Скорость
+        героя здесь не участвует - она является общим делителем всех
+        ребер и применяется к готовому полю одним делением.
+
+        @param source Кортеж (row, col) стартовой позиции.
+        @return Массив numpy (высота x ширина, float32) минимальных
+                стоимостей пути; inf для недостижимых клеток.
+        """
+        height, width = self.maze.height, self.maze.width
+        if not self.maze.is_valid_position(source):
+            return np.full((height, width), np.inf, dtype=np.float32)
+
+        flat_cost = self._cost_array().ravel()
+        start_idx = source[0] * width + source[1]
+
+        # Целочисленные стоимости обслуживает карманная очередь Дайала:
+        # извлечение минимума без логарифма кучи. Результат копируется из
+        # рабочего буфера, который переиспользует следующий вызов
+        if _dial_nb is not None and self._icost is not None:
+            dist = self._scratch_buffer()
+            self._touched_n = _dial_nb(self._icost, height, width, start_idx,
+                                       np.float32(0.5), dist, self._touched)
+            return dist.reshape(height, width).copy()
+
+        # Скомпилированное ядро выполняет весь цикл вне интерпретатора
+        if _dijkstra_nb is not None:
+            dist = self._scratch_buffer()
+            self._touched_n = _dijkstra_nb(flat_cost, height, width,
+                                           start_idx, dist, self._touched)
+            return dist.reshape(height, width).copy()
+
+        dist = np.full(height * width, np.inf, dtype=np.float32)
+        closed = np.zeros(height * width, dtype=np.bool_)
+        dist[start_idx] = 0.0
+        queue = [(0.0, start_idx)]
+
+        # Предвычисленные стоимости шага по направлениям: inf на границе
+        # сетки делает проверку границ и чтение стоимости одним сравнением
+        edges = getattr(self.maze, 'edge_cost', None)
+        if edges is None:
+            cost2d = flat_cost.reshape(height, width)
+            edges = np.full((4, height, width), np.inf, dtype=np.float32)
+            edges[0, 1:, :] = cost2d[:-1, :]
+            edges[1, :-1, :] = cost2d[1:, :]
+            edges[2, :, 1:] = cost2d[:, :-1]
+            edges[3, :, :-1] = cost2d[:, 1:]
+            edges = edges.reshape(4, -1)
+        offsets = (-width, width, -1, 1)
+
+        while queue:
+            current_time, current = heapq.heappop(queue)
+            if closed[current]:
+                continue
+            closed[current] = True
+
+            for k in range(4):
+                step = edges[k, current]
+                if step == np.inf:
+                    continue
+                neighbor = current + offsets[k]
+                if closed[neighbor]:
+                    continue
+                new_time = current_time + step
+                if new_time < dist[neighbor]:
+                    dist[neighbor] = new_time
+                    heapq.heappush(queue, (float(new_time), neighbor))
+
+        return dist.reshape(height, width)
+
+    def _astar_to_target(self, source, target):
+        """
+        @brief Вычисляет стоимость пути от источника до одной целевой клетки.
+
+        @details
+        Для запроса к единственной цели полное поле расстояний не нужно:
+        A* с допустимой эвристикой (манхэттенское расстояние, умноженное
+        на минимальную конечную стоимость клетки) раскрывает порядка
+        длины пути клеток вместо всей сетки. Скорость героя, как и в
+        _compute_distance_field, применяется вызывающим кодом.
+
+        @param source Кортеж (row, col) стартовой позиции.
+        @param target Кортеж (row, col) целевой позиции.
+        @return Минимальная стоимость пути или inf, если цель недостижима.
+        """
+        height, width = self.maze.height, self.maze.width
+        if (not self.maze.is_valid_position(source)
+                or not self.maze.is_valid_position(target)):
+            return float('inf')
+        if source == target:
+            return 0.0
+
+        cost = self._cost_array()
+        finite = cost[np.isfinite(cost)]
+        if finite.size == 0:
+            return float('inf')
+        min_step = float(finite.min())
+
+        edges = getattr(self.maze, 'edge_cost', None)
+        if edges is None:
+            edges = np.full((4, height, width), np.inf, dtype=np.float32)
+            edges[0, 1:, :] = cost[:-1, :]
+            edges[1, :-1, :] = cost[1:, :]
+            edges[2, :, 1:] = cost[:, :-1]
+            edges[3, :, :-1] = cost[:, 1:]
+            edges = edges.reshape(4, -1)
+        offsets = (-width, width, -1, 1)
+
+        start_idx = source[0] * width + source[1]
+        target_idx = target[0] * width + target[1]
+        target_row, target_col = target
+
+        g_score = np.full(height * width, np.inf, dtype=np.float32)
+        g_score[start_idx] = 0.0
+        closed = np.zeros(height * width, dtype=np.bool_)
+        open_set = [(min_step * (abs(source[0] - target_row)
+                                 + abs(source[1] - target_col)), start_idx)]
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current == target_idx:
+                return float(g_score[current])
+            if closed[current]:
+                continue
+            closed[current] = True
+
+            g_current = float(g_score[current])
+            for k in range(4):
+                step = edges[k, current]
+                if step == np.inf:
+                    continue
+                neighbor = current + offsets[k]
+                if closed[neighbor]:
+                    continue
+                tentative = g_current + float(step)
+                if tentative >= g_score[neighbor]:
+                    continue
+                g_score[neighbor] = tentative
+                h_value = min_step * (abs(neighbor // width - target_row)
+                                      + abs(neighbor % width - target_col))
+                heapq.heappush(open_set, (tentative + h_value, neighbor))
+
+        return float('inf')
+
+    def _compute_distance_fields_bitparallel(self, sources, step_cost, passable):
+        """
+        @brief Битово-параллельный BFS для сеток с одинаковой стоимостью клеток.
+
+        @details
+        Когда все проходимые клетки стоят одинаково, поиск Дейкстры
+        вырождается в BFS по уровням. Фронты волн до 64 источников
+        упаковываются в один uint64 на клетку (бит i - волна источника i),
+        и каждый уровень продвигает все волны сразу четырьмя сдвигами
+        маски с побитовым ИЛИ: один проход по сетке вместо S проходов.
+
+        @param sources Список стартовых позиций (не более 64).
+        @param step_cost Стоимость шага, одинаковая для всех клеток.
+        @param passable Булева маска проходимых клеток.
+        @return Массив numpy формы (S, высота, ширина) float32.
+        """
+        height, width = self.maze.height, self.maze.width
+        n_sources = len(sources)
+        fields = np.full((n_sources, height, width), np.inf, dtype=np.float32)
+
+        frontier = np.zeros((height, width), dtype=np.uint64)
+        for i, source in enumerate(sources):
+            if self.maze.is_valid_position(source):
+                frontier[source] |= np.uint64(1) << np.uint64(i)
+                fields[i][source] = 0.0
+        visited = frontier.copy()
+
+        level = 0
+        while frontier.any():
+            level += 1
+            # Волны всех источников шагают на соседние клетки одним
+            # побитовым ИЛИ четырех сдвинутых масок
+            shifted = np.zeros((height, width), dtype=np.uint64)
+            shifted[:-1, :] |= frontier[1:, :]
+            shifted[1:, :] |= frontier[:-1, :]
+            shifted[:, :-1] |= frontier[:, 1:]
+            shifted[:, 1:] |= frontier[:, :-1]
+
+            new = shifted & ~visited
+            new[~passable] = 0
+            if not new.any():
+                break
+
+            distance = np.float32(level * step_cost)
+            for i in range(n_sources):
+                reached = (new >> np.uint64(i)) & np.uint64(1) != 0
+                fields[i][reached] = distance
+
+            visited |= new
+            frontier = new
+
+        return fields
+
+    def _build_csr(self, cost):
+        """
+        @brief Строит разреженный граф лабиринта для scipy.sparse.csgraph.
+
+        @details
+        Вершины нумеруются как row * width + col; для каждой пары соседних
+        проходимых клеток создается направленное ребро u -> v с весом,
+        равным стоимости входа в v (как в CSR-представлении
+        TerrainPathFinder). Граф кэшируется до смены сетки стоимостей.
+
+        @param cost Массив numpy (высота x ширина) стоимостей клеток.
+        @return Разреженная матрица csr_matrix размера (N, N).
+        """
+        if getattr(self, '_csr_grid', None) is cost:
+            return self._csr
+
+        height, width = cost.shape
+
+        # Для собственной сетки лабиринта массивы CSR предвычислены
+        # в TerrainMaze.__init__ - остается обернуть их в csr_matrix
+        if (cost is getattr(self.maze, 'cost_grid', None)
+                and getattr(self.maze, 'adj_indptr', None) is not None):
+            n = height * width
+            graph = csr_matrix(
+                (self.maze.adj_edge_cost, self.maze.adj_indices,
+                 self.maze.adj_indptr), shape=(n, n))
+            self._csr_grid = cost
+            self._csr = graph
+            return graph
+
+        passable = np.isfinite(cost)
+
+        sources = []
+        targets = []
+
+        rows, cols = np.nonzero(passable[:-1] & passable[1:])
+        down = rows * width + cols
+        sources.extend((down, down + width))
+        targets.extend((down + width, down))
+
+        rows, cols = np.nonzero(passable[:, :-1] & passable[:, 1:])
+        right = rows * width + cols
+        sources.extend((right, right + 1))
+        targets.extend((right + 1, right))
+
+        u = np.concatenate(sources)
+        v = np.concatenate(targets)
+        n = height * width
+        graph = csr_matrix((cost.ravel()[v].astype(np.float32), (u, v)),
+                           shape=(n, n))
+
+        self._csr_grid = cost
+        self._csr = graph
+        return graph
+
+    def _compute_distance_fields_scipy(self, sources, cost):
+        """
+        @brief Вычисляет поля расстояний всех источников через scipy.
+
+        @details
+        Вся работа с кучей выполняется в C-коде csgraph.dijkstra, который
+        на время счета освобождает GIL; независимые источники поэтому
+        раздаются потокам пула и масштабируются по ядрам.
+
+        @param sources Список стартовых позиций героев.
+        @param cost Массив numpy (высота x ширина) стоимостей клеток.
+        @return Массив numpy формы (S, высота, ширина) float32.
+        """
+        height, width = self.maze.height, self.maze.width
+        fields = np.full((len(sources), height, width), np.inf,
+                         dtype=np.float32)
+
+        valid = [i for i, source in enumerate(sources)
+                 if self.maze.is_valid_position(source)]
+        if valid:
+            graph = self._build_csr(cost)
+            starts = [sources[i][0] * width + sources[i][1] for i in valid]
+
+            def run(start):
+                return _csgraph_dijkstra(graph, indices=start, directed=True)
+
+            if len(starts) > 1:
+                workers = min(len(starts), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    dists = list(pool.map(run, starts))
+            else:
+                dists = [run(starts[0])]
+
+            # csgraph считает в float64; к float32 конвейера результат
+            # приводится при записи в тензор
+            for row, i in enumerate(valid):
+                fields[i] = dists[row].reshape(height, width)
+
+        return fields
+
+    def _as_arrays(self, sources, speeds):
+        """
+        @brief Переводит списки источников и скоростей в плоские массивы.
+
+        @details
+        Публичный API принимает списки кортежей и чисел; внутренние
+        потребители (ядра numba, csgraph, редукции numpy) работают с
+        непрерывными массивами без распаковки кортежей на каждой
+        итерации. Преобразование выполняется один раз на вызов.
+
+        @param sources Список стартовых позиций (row, col).
+        @param speeds Список скоростей или None для единичных скоростей.
+        @return Кортеж (src_ids, speed_arr): int32-массив плоских индексов
+                row * width + col и float32-массив скоростей.
+        """
+        src = np.asarray(sources, dtype=np.int32).reshape(-1, 2)
+        src_ids = src[:, 0] * self.maze.width + src[:, 1]
+        if speeds is None:
+            speed_arr = np.ones(src_ids.shape[0], dtype=np.float32)
+        else:
+            speed_arr = np.asarray(speeds, dtype=np.float32)
+        if src_ids.shape[0] != speed_arr.shape[0]:
+            raise ValueError("Количество источников и скоростей должно совпадать")
+        return src_ids, speed_arr
+
+    def _compute_distance_fields(self, sources, speeds=None):
+        """
+        @brief Строит тензор времен пути от всех источников сразу.
+
+        @param sources Список стартовых позиций героев.
+        @param speeds Список скоростей героев или None для равных скоростей.
+        @return Массив numpy формы (S, высота, ширина) float32, где срез s -
+                поле времен пути героя s; inf для недостижимых клеток.
+        """
+        src_ids, speed_arr = self._as_arrays(sources, speeds)
+
+        cost = self._check_dist_cache()
+
+        # Поля, уже посчитанные прежними вызовами, переиспользуются;
+        # пересчет запускается лишь когда хотя бы одно поле отсутствует
+        cached = [self._dist_cache.get(source) for source in sources]
+        if all(field is not None for field in cached):
+            fields = np.stack(cached)
+            fields /= speed_arr[:, None, None]
+            return fields
+
+        # Сетки с единой стоимостью проходимых клеток (и не более 64
+        # источников) обслуживает битово-параллельный BFS; взвешенный
+        # Дейкстра остается для неоднородных стоимостей
+        passable = np.isfinite(cost)
+        finite_costs = cost[passable]
+        if (len(sources) <= 64 and finite_costs.size > 0
+                and bool(np.all(finite_costs == finite_costs.flat[0]))):
+            fields = self._compute_distance_fields_bitparallel(
+                sources, float(finite_costs.flat[0]), passable)
+        elif _multi_dijkstra_nb is not None and len(sources) > 1:
+            # Поиски от источников независимы: скомпилированное ядро
+            # раздает их потокам через prange
+            height, width = self.maze.height, self.maze.width
+            fields = np.full((len(sources), height, width), np.inf,
+                             dtype=np.float32)
+            valid = [i for i, source in enumerate(sources)
+                     if self.maze.is_valid_position(source)]
+            if valid:
+                starts = src_ids[valid].astype(np.int64)
+                out = np.full((len(valid), height * width), np.inf,
+                              dtype=np.float32)
+                _multi_dijkstra_nb(cost.ravel(), height, width, starts, out)
+                for row, i in enumerate(valid):
+                    fields[i] = out[row].reshape(height, width)
+        elif _csgraph_dijkstra is not None and len(sources) > 1:
+            # Без numba многоисточниковый расчет выполняет scipy:
+            # вся работа с кучей остается в C-коде csgraph
+            fields = self._compute_distance_fields_scipy(sources, cost)
+        else:
+            fields = np.stack([self._dist_from(source)
+                               for source in sources])
+
+        # Кэшируются копии до масштабирования: деление на скорости ниже
+        # выполняется на месте
+        for i, source in enumerate(sources):
+            if cached[i] is None:
+                self._dist_cache.setdefault(source, fields[i].copy())
+
+        # Скорость масштабирует все ребра одинаково, поэтому делится
+        # готовое поле целиком
+        fields /= speed_arr[:, None, None]
+        return fields
+
     def compute_distances_with_costs(self, sources, speeds=None):
         """
         @brief Вычисляет минимальные расстояния от источников до всех точек лабиринта с учетом стоимости перемещения.
-        
+
         @param sources Список стартовых позиций героев.
         @param speeds Список скоростей передвижения героев. Если не указан, то используется одинаковая скорость для всех.
-        
-        @return Словарь, где ключи - позиции в лабиринте, а значения - словари, содержащие время пути от каждого источника.
-        
+
+        @return Словарь, где ключи - индексы источников, а значения - словари
+                {позиция: время пути} по всем достижимым позициям.
+
         @details
-        Этот метод использует модифицированный алгоритм Дейкстры для вычисления минимального
-        времени пути от каждого источника до всех доступных точек в лабиринте.
+        Времена пути считаются единым тензором (источники x высота x ширина)
+        методом _compute_distance_fields; словарное представление строится
+        поверх тензора для удобства вызывающего кода.
         """
         if not sources:
             return {}
-        
-        # Если скорости не указаны, используем одинаковую скорость для всех
-        if speeds is None:
-            speeds = [1.0] * len(sources)
-            
-        # Проверяем, что количество источников и скоростей совпадает
-        if len(sources) != len(speeds):
-            raise ValueError("Количество источников и скоростей должно совпадать")
-        
-        # Инициализируем словарь для хранения минимального времени от каждого источника
-        # до каждой позиции в лабиринте
-        distances = defaultdict(dict)
-        
-        # Для каждого источника проводим расчет минимального времени пути
-        for idx, (source, speed) in enumerate(zip(sources, speeds)):
-            # Проверяем, что источник находится внутри лабиринта
-            if not self.maze.is_valid_position(source):
-                continue
-            
-            # Приоритетная очередь для Дейкстры
-            # Формат элемента: (время, позиция)
-            priority_queue = [(0, source)]
-            
-            # Словарь, содержащий текущее минимальное время пути до каждой позиции
-            time_so_far = {source: 0}
-            
-            while priority_queue:
-                # Извлекаем позицию с минимальным временем
-                current_time, current_pos = heapq.heappop(priority_queue)
-                
-                # Если текущее время больше, чем известное минимальное, пропускаем
-                if current_time > time_so_far[current_pos]:
-                    continue
-                
-                # Сохраняем минимальное время пути для текущей позиции
-                distances[current_pos][idx] = current_time
-                
-                # Проверяем все соседние позиции
-                for next_pos in self.maze.get_neighbors(current_pos):
-                    # Вычисляем новое время пути с учетом стоимости перемещения и скорости героя
-                    terrain_cost = self.maze.get_terrain_cost(next_pos)
-                    time_to_move = terrain_cost / speed
-                    new_time = current_time + time_to_move
-                    
-                    # Если мы нашли новый лучший путь до next_pos или это первый найденный путь
-                    if next_pos not in time_so_far or new_time < time_so_far[next_pos]:
-                        time_so_far[next_pos] = new_time
-                        heapq.heappush(priority_queue, (new_time, next_pos))
-        
+
+        fields = self._compute_distance_fields(sources, speeds)
+
+        distances = {}
+        for idx in range(len(sources)):
+            rows, cols = np.where(np.isfinite(fields[idx]))
+            values = fields[idx, rows, cols]
+            distances[idx] = {
+                (int(r), int(c)): float(v)
+                for r, c, v in zip(rows, cols, values)
+            }
         return distances
     
     def find_optimal_gathering_point(self, hero_positions, hero_speeds=None):
@@ -135,32 +605,21 @@ class TerrainEquidistantFinder(EquidistantFinder):
         """
         if not hero_positions:
             return None
-        
-        # Вычисляем расстояния с учетом стоимости перемещения и скоростей
-        distances = self.compute_distances_with_costs(hero_positions, hero_speeds)
-        
-        # Если расстояния не вычислены, возвращаем None
-        if not distances:
+
+        # Времена пути всех героев единым тензором (S, высота, ширина)
+        fields = self._compute_distance_fields(hero_positions, hero_speeds)
+
+        # Худшее время прибытия в каждую клетку; бесконечность там, куда
+        # хотя бы один герой добраться не может, поэтому отдельная
+        # фильтрация недостижимых позиций не нужна
+        worst = fields.max(axis=0)
+
+        best = int(worst.argmin())
+        if worst.flat[best] == np.inf:
             return None
-        
-        # Находим точку с минимальным максимальным временем
-        min_max_time = float('inf')
-        optimal_point = None
-        
-        for pos, times in distances.items():
-            # Если не все герои могут достичь этой точки, пропускаем её
-            if len(times) != len(hero_positions):
-                continue
-            
-            # Находим максимальное время прибытия для этой точки
-            max_time = max(times.values())
-            
-            # Если найдена точка с меньшим максимальным временем, обновляем результат
-            if max_time < min_max_time:
-                min_max_time = max_time
-                optimal_point = pos
-        
-        return optimal_point
+
+        row, col = np.unravel_index(best, worst.shape)
+        return (int(row), int(col))
     
     def get_arrival_times(self, gathering_point, hero_positions, hero_speeds=None):
         """
@@ -171,21 +630,46 @@ class TerrainEquidistantFinder(EquidistantFinder):
         @param hero_speeds Список скоростей передвижения героев. Если не указан, то используется одинаковая скорость для всех.
         
         @return Список времен прибытия для каждого героя.
+
+        @details
+        Одно поле расстояний от точки сбора заменяет поиск от каждого
+        героя: времена всех героев собираются одной векторной выборкой.
+        Стоимость входа несимметрична (платится за клетку назначения),
+        поэтому обратное расстояние корректируется на разницу стоимостей
+        концевых клеток: d(герой -> сбор) = d(сбор -> герой) +
+        cost(сбор) - cost(герой).
         """
         if not gathering_point or not hero_positions:
             return []
-        
-        # Вычисляем расстояния с учетом стоимости перемещения и скоростей
-        distances = self.compute_distances_with_costs(hero_positions, hero_speeds)
-        
-        # Если точка сбора не достижима для всех героев, возвращаем пустой список
-        if gathering_point not in distances or len(distances[gathering_point]) != len(hero_positions):
+
+        if not self.maze.is_valid_position(gathering_point):
             return []
-        
-        # Извлекаем времена прибытия для каждого героя
-        arrival_times = [distances[gathering_point][idx] for idx in range(len(hero_positions))]
-        
-        return arrival_times
+        if not all(self.maze.is_valid_position(hero)
+                   for hero in hero_positions):
+            return []
+
+        src_ids, speed_arr = self._as_arrays(hero_positions, hero_speeds)
+
+        field = self._dist_from(gathering_point).ravel()
+        cost = self._cost_array().ravel()
+        target_cost = cost[gathering_point[0] * self.maze.width
+                           + gathering_point[1]]
+        times = field[src_ids] + target_cost - cost[src_ids]
+
+        # Герой на клетке с бесконечной стоимостью входа через обратное
+        # поле не выражается - для таких позиций остается целевой A*
+        bad = ~np.isfinite(times)
+        if bad.any():
+            for i in np.nonzero(bad)[0]:
+                times[i] = self._astar_to_target(
+                    tuple(hero_positions[int(i)]), gathering_point)
+
+        # Если точка сбора не достижима для всех героев,
+        # возвращаем пустой список
+        if not bool(np.all(np.isfinite(times))):
+            return []
+
+        return [float(time) for time in times / speed_arr]
     
     def get_max_arrival_time(self, gathering_point, hero_positions, hero_speeds=None):
         """
@@ -196,10 +680,33 @@ class TerrainEquidistantFinder(EquidistantFinder):
         @param hero_speeds Список скоростей передвижения героев. Если не указан, то используется одинаковая скорость для всех.
         
         @return Максимальное время прибытия.
+
+        @details
+        Полное поле расстояний здесь не нужно: для героев, чьи поля еще
+        не посчитаны, выполняется целевой A*-запрос, обрывающий поиск,
+        как только точка сбора извлечена из очереди; уже закэшированные
+        поля читаются одним обращением.
         """
-        arrival_times = self.get_arrival_times(gathering_point, hero_positions, hero_speeds)
-        
-        if not arrival_times:
+        if not gathering_point or not hero_positions:
             return float('inf')
-        
-        return max(arrival_times) 
\ No newline at end of file
+
+        if not self.maze.is_valid_position(gathering_point):
+            return float('inf')
+
+        if hero_speeds is None:
+            hero_speeds = [1.0] * len(hero_positions)
+        if len(hero_positions) != len(hero_speeds):
+            raise ValueError("Количество источников и скоростей должно совпадать")
+
+        self._check_dist_cache()
+        worst = 0.0
+        for hero, speed in zip(hero_positions, hero_speeds):
+            field = self._dist_cache.get(hero)
+            if field is not None:
+                time = float(field[gathering_point])
+            else:
+                time = self._astar_to_target(hero, gathering_point)
+            if time == float('inf'):
+                return float('inf')
+            worst = max(worst, time / speed)
+        return worst 
\ No newline at end of file
@@ -7,8 +7,19 @@
 и добавляет поддержку различных типов местности с разной стоимостью прохода.
 """
 
+import sys
+import os
+import weakref
+
+import numpy as np
+
 from maze import Maze
 
+# Добавляем корневой каталог проекта в путь поиска модулей
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.hex.hex_terrain_type import HexTerrainType
+
 class TerrainMaze(Maze):
     """
     @brief Класс для представления лабиринта с различными типами местности.
@@ -42,7 +53,25 @@ class TerrainMaze(Maze):
         '8': {'name': 'Hero8', 'cost': 1.0, 'passable': True, 'color': 'lightgreen'},
         '9': {'name': 'Hero9', 'cost': 1.0, 'passable': True, 'color': 'lightgreen'},
     }
-    
+
+    # Значение-страж в квантованной сетке стоимостей cost_grid_i8,
+    # обозначающее непроходимую клетку
+    IMPASSABLE_I8 = 127
+
+    # Соответствие символов местности типам из HexTerrainType.
+    # Используется для применения расовых модификаторов к сетке стоимостей.
+    TERRAIN_CHAR_TO_HEX = {
+        'R': HexTerrainType.ROAD,
+        'G': HexTerrainType.GRASS,
+        'H': HexTerrainType.HILLS,
+        'S': HexTerrainType.SWAMP,
+        'W': HexTerrainType.WATER,
+        'M': HexTerrainType.MOUNTAIN,
+        '#': HexTerrainType.WALL,
+        '1': HexTerrainType.START,
+        'F': HexTerrainType.END,
+    }
+
     def __init__(self, grid=None):
         """
         @brief Инициализация объекта TerrainMaze.
@@ -83,7 +112,187 @@ class TerrainMaze(Maze):
         
         # Вызываем инициализатор родительского класса
         super().__init__(grid)
-    
+
+        # Сетка нормализуется в один непрерывный uint8-массив кодов
+        # символов: обращение к клетке обходится без двойной индексации
+        # python-контейнеров, а векторные операции ниже (LUT модификаторов,
+        # маски) работают по всей сетке сразу. Принимаются как списки
+        # строк, так и списки списков; ячейки, не являющиеся одиночным
+        # символом, получают код 0, которого нет в TERRAIN_TYPES
+        def _row_bytes(row):
+            if isinstance(row, str):
+                return row.encode('latin-1')
+            return bytes(ord(cell) if isinstance(cell, str) and len(cell) == 1
+                         else 0 for cell in row)
+
+        self.grid_codes = np.frombuffer(
+            b''.join(_row_bytes(row) for row in self.grid), dtype=np.uint8
+        ).reshape(self.height, self.width)
+
+        # Сетка стоимостей строится одним векторным обращением: таблица
+        # из 256 элементов, индексируемая кодом символа, заменяет H*W
+        # словарных запросов к TERRAIN_TYPES
+        self.cost_grid = self._terrain_cost_lut()[self.grid_codes]
+
+        # Маска проходимости: у всех проходимых типов местности конечная
+        # стоимость, поэтому она выводится из сетки стоимостей одной
+        # векторной операцией
+        self._passable = np.isfinite(self.cost_grid)
+
+        # Стоимости шага из клетки по четырем направлениям (вверх, вниз,
+        # влево, вправо): edge_cost[d, i*W+j] - цена входа в соседа, inf
+        # за границей сетки. Релаксация в поиске пути читает одно число
+        # вместо проверки границ и обращения к сетке стоимостей
+        edge = np.full((4, self.height, self.width), np.inf, dtype=np.float32)
+        if self.height > 0 and self.width > 0:
+            edge[0, 1:, :] = self.cost_grid[:-1, :]
+            edge[1, :-1, :] = self.cost_grid[1:, :]
+            edge[2, :, 1:] = self.cost_grid[:, :-1]
+            edge[3, :, :-1] = self.cost_grid[:, 1:]
+        self.edge_cost = edge.reshape(4, -1)
+
+        # CSR-представление графа соседства: adj_indptr[u]..adj_indptr[u+1]
+        # ограничивают в adj_indices номера проходимых соседей клетки u
+        # (нумерация row * width + col), adj_edge_cost хранит стоимость
+        # входа в соседа. Внутренние циклы поиска сканируют соседей
+        # линейным проходом по непрерывным массивам
+        self.adj_indptr, self.adj_indices, self.adj_edge_cost = \
+            self.build_adjacency_csr(self.cost_grid)
+
+        # Квантованная копия сетки стоимостей: удвоенные стоимости помещаются
+        # в int8 (сетка занимает в 4 раза меньше памяти, чем float32),
+        # IMPASSABLE_I8 обозначает непроходимую клетку. Публичный API
+        # продолжает работать с float-сеткой cost_grid.
+        scaled = self.cost_grid * 2.0
+        finite = np.isfinite(scaled)
+        if (bool(np.all(scaled[finite] == np.rint(scaled[finite]))) and
+                (not finite.any() or float(scaled[finite].max()) < self.IMPASSABLE_I8)):
+            self.cost_grid_i8 = np.where(
+                finite, np.rint(np.where(finite, scaled, 0)), self.IMPASSABLE_I8
+            ).astype(np.int8)
+        else:
+            self.cost_grid_i8 = None
+
+        # Кэш сеток стоимостей с расовыми модификаторами (по классу расы)
+        self._race_cost_cache = weakref.WeakValueDictionary()
+
+        # Кэши списков соседей по позиции: сетка после построения не
+        # изменяется, поэтому четыре проверки проходимости на клетку
+        # выполняются лишь один раз за все время жизни лабиринта
+        self._neighbor_cache = {}
+        self._neighbor_cost_cache = {}
+
+    @classmethod
+    def _terrain_cost_lut(cls):
+        """
+        @brief Возвращает таблицу стоимостей, индексируемую кодом символа.
+
+        @details
+        Таблица выводится из TERRAIN_TYPES один раз на класс (подклассы
+        с собственным набором местностей получают собственную таблицу);
+        коды без описания остаются бесконечными, то есть непроходимыми.
+
+        @return Массив numpy из 256 элементов float32.
+        """
+        lut = cls.__dict__.get('_cost_lut')
+        if lut is None:
+            lut = np.full(256, np.inf, dtype=np.float32)
+            for char, info in cls.TERRAIN_TYPES.items():
+                lut[ord(char)] = info['cost']
+            cls._cost_lut = lut
+        return lut
+
+    @classmethod
+    def _terrain_info_lut(cls):
+        """
+        @brief Возвращает таблицу описаний местности по коду символа.
+
+        @return Список из 256 словарей-описаний; коды без описания
+                отображаются на словарь неизвестной местности.
+        """
+        lut = cls.__dict__.get('_info_lut')
+        if lut is None:
+            unknown = {'name': 'Unknown', 'cost': float('inf'),
+                       'passable': False, 'color': 'white'}
+            lut = [unknown] * 256
+            for char, info in cls.TERRAIN_TYPES.items():
+                lut[ord(char)] = info
+            cls._info_lut = lut
+        return lut
+
+    @staticmethod
+    def build_adjacency_csr(cost_grid):
+        """
+        @brief Строит CSR-представление графа соседства по сетке стоимостей.
+
+        @details
+        Вершины нумеруются как row * width + col. Ребро u -> v с весом,
+        равным стоимости клетки v, создается для каждой пары соседних
+        проходимых клеток. Для сетки лабиринта результат предвычислен
+        в __init__; метод доступен и для сеток с расовыми модификаторами.
+
+        @param cost_grid Массив numpy со стоимостями клеток (inf - непроходимо).
+        @return Кортеж (indptr, indices, weights) - массивы int32/int32/float32.
+        """
+        height, width = cost_grid.shape
+        passable = np.isfinite(cost_grid)
+
+        sources = []
+        targets = []
+
+        # Ребра по четырем направлениям между парами проходимых клеток
+        rows, cols = np.nonzero(passable[:-1] & passable[1:])
+        down = rows * width + cols
+        sources.extend((down, down + width))
+        targets.extend((down + width, down))
+
+        rows, cols = np.nonzero(passable[:, :-1] & passable[:, 1:])
+        right = rows * width + cols
+        sources.extend((right, right + 1))
+        targets.extend((right + 1, right))
+
+        u = np.concatenate(sources).astype(np.int32)
+        v = np.concatenate(targets).astype(np.int32)
+
+        order = np.argsort(u, kind='stable')
+        u = u[order]
+        v = v[order]
+
+        n = height * width
+        indptr = np.searchsorted(u, np.arange(n + 1)).astype(np.int32)
+        weights = cost_grid.ravel()[v].astype(np.float32)
+
+        return indptr, v, weights
+
+    def get_cost_grid_for_race(self, race):
+        """
+        @brief Возвращает сетку стоимостей прохода с учетом расовых модификаторов.
+
+        @details
+        Модификатор расы для каждого символа местности вычисляется один раз
+        и применяется ко всей сетке стоимостей за одну векторную операцию.
+        Результат кэшируется по классу расы, поэтому повторные вызовы
+        для одной расы не пересчитывают сетку.
+
+        @param race Раса (класс или экземпляр Race), модификаторы которой применяются.
+        @return Массив numpy (высота x ширина, float32) с модифицированными стоимостями.
+        """
+        race_cls = race if isinstance(race, type) else type(race)
+
+        cached = self._race_cost_cache.get(race_cls)
+        if cached is not None:
+            return cached
+
+        # Таблица модификаторов, индексируемая кодом символа местности
+        modifier_lut = np.ones(256, dtype=np.float32)
+        for char, terrain_type in self.TERRAIN_CHAR_TO_HEX.items():
+            modifier_lut[ord(char)] = race_cls.get_terrain_modifier(terrain_type)
+
+        race_cost_grid = self.cost_grid * modifier_lut[self.grid_codes]
+        self._race_cost_cache[race_cls] = race_cost_grid
+
+        return race_cost_grid
+
     def get_terrain_type(self, position):
         """
         @brief Возвращает тип местности для указанной позиции.
@@ -93,9 +302,11 @@ class TerrainMaze(Maze):
         """
         if not self.is_valid_position(position):
             return ' '
-        
+
+        # Чтение из непрерывного массива кодов вместо двух индексаций
+        # вложенных списков
         row, col = position
-        return self.grid[row][col]
+        return chr(self.grid_codes[row, col])
     
     def get_terrain_info(self, position):
         """
@@ -104,8 +315,14 @@ class TerrainMaze(Maze):
         @param position Кортеж (row, col) с координатами клетки.
         @return Словарь с информацией о типе местности или None, если позиция недопустима.
         """
-        terrain_type = self.get_terrain_type(position)
-        return self.TERRAIN_TYPES.get(terrain_type, {'name': 'Unknown', 'cost': float('inf'), 'passable': False, 'color': 'white'})
+        # Код символа индексирует предвычисленную таблицу описаний;
+        # недопустимая позиция отображается на пустую клетку, как и в
+        # get_terrain_type
+        if self.is_valid_position(position):
+            code = self.grid_codes[position]
+        else:
+            code = ord(' ')
+        return self._terrain_info_lut()[code]
     
     def get_terrain_cost(self, position):
         """
@@ -114,21 +331,23 @@ class TerrainMaze(Maze):
         @param position Кортеж (row, col) с координатами клетки.
         @return Число, обозначающее стоимость прохода через клетку.
         """
-        info = self.get_terrain_info(position)
-        return info['cost']
-    
+        # Чтение из предвычисленной сетки вместо сборки словаря описания
+        row, col = position
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return float(self.cost_grid[row, col])
+        return float('inf')
+
     def is_passable(self, position):
         """
         @brief Проверяет, проходима ли указанная клетка.
-        
+
         @param position Кортеж (row, col) с координатами клетки.
         @return True, если клетка проходима, иначе False.
         """
-        if not self.is_valid_position(position):
-            return False
-        
-        info = self.get_terrain_info(position)
-        return info['passable']
+        row, col = position
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return bool(self._passable[row, col])
+        return False
     
     def get_neighbors(self, position):
         """
@@ -141,22 +360,39 @@ class TerrainMaze(Maze):
         @param position Кортеж (row, col) с координатами клетки.
         @return Список кортежей с координатами проходимых соседних клеток.
         """
-        neighbors = []
+        neighbors = self._neighbor_cache.get(position)
+        if neighbors is not None:
+            return neighbors
+
         row, col = position
-        
-        # Проверяем все 4 соседние клетки
-        potential_neighbors = [
-            (row-1, col),  # Вверх
-            (row+1, col),  # Вниз
-            (row, col-1),  # Влево
-            (row, col+1)   # Вправо
-        ]
-        
-        for neighbor in potential_neighbors:
-            if self.is_passable(neighbor):
-                neighbors.append(neighbor)
-        
+
+        # Проверяем все 4 соседние клетки (вверх, вниз, влево, вправо)
+        neighbors = [neighbor for neighbor in
+                     ((row - 1, col), (row + 1, col),
+                      (row, col - 1), (row, col + 1))
+                     if self.is_passable(neighbor)]
+
+        self._neighbor_cache[position] = neighbors
         return neighbors
+
+    def neighbors_with_cost(self, position):
+        """
+        @brief Возвращает проходимых соседей вместе со стоимостью входа.
+
+        @details
+        Внутренним циклам поиска пути нужны и координаты соседа, и
+        стоимость шага в него; совмещенный кэшированный список избавляет
+        от повторного обращения к сетке стоимостей на каждую релаксацию.
+
+        @param position Кортеж (row, col) с координатами клетки.
+        @return Список кортежей (row, col, cost) проходимых соседей.
+        """
+        entries = self._neighbor_cost_cache.get(position)
+        if entries is None:
+            entries = [(r, c, float(self.cost_grid[r, c]))
+                       for r, c in self.get_neighbors(position)]
+            self._neighbor_cost_cache[position] = entries
+        return entries
     
     def __str__(self):
         """
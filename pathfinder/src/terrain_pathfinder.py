@@ -9,10 +9,80 @@
 разных типов местности и стоимости перемещения.
 """
 
-import heapq
+import struct
+
+import numpy as np
+
+import heap4
 from pathfinder import PathFinder
 from terrain_maze import TerrainMaze
 
+import _pathfinder_ctypes
+
+try:
+    from _dijkstra_nb import dijkstra_path as _dijkstra_path_nb
+except ImportError:
+    # numba не установлена - остаются Python-реализации ниже
+    _dijkstra_path_nb = None
+
+try:
+    from scipy.ndimage import label as _ndimage_label
+except ImportError:
+    # scipy не установлена - разметка компонент выполняется обходом в ширину
+    _ndimage_label = None
+
+try:
+    from scipy.sparse import csr_matrix as _csr_matrix
+    from scipy.sparse.csgraph import dijkstra as _csgraph_dijkstra
+except ImportError:
+    # scipy не установлена - остаются Python-реализации ниже
+    _csr_matrix = None
+    _csgraph_dijkstra = None
+
+# Количество бит, отведенных под индекс клетки в упакованном ключе кучи.
+# Позволяет адресовать до 2^20 (около миллиона) клеток лабиринта.
+_IDX_BITS = 20
+_IDX_MASK = (1 << _IDX_BITS) - 1
+
+# Упаковка вещественной стоимости в целочисленный ключ кучи: битовое
+# представление неотрицательного конечного float32 монотонно по значению,
+# поэтому ключ (биты_стоимости << 32) | индекс сравнивается как одно
+# целое число вместо кортежа (float, int)
+_F32_PACK = struct.Struct('<f').pack
+_F32_UNPACK = struct.Struct('<f').unpack
+
+# Сторожевое значение "клетка не достигнута" для целочисленных расстояний
+_UNREACHED = 1 << 62
+
+
+def _pack_key(cost, idx):
+    """
+    @brief Упаковывает стоимость float32 и индекс клетки в один ключ int64.
+
+    @param cost Неотрицательная конечная стоимость пути.
+    @param idx Плоский индекс клетки (до 2^32).
+    @return Целочисленный ключ, сохраняющий порядок сравнения по стоимости.
+    """
+    return (int.from_bytes(_F32_PACK(cost), 'little') << 32) | idx
+
+
+def _key_cost(key):
+    """
+    @brief Извлекает стоимость из упакованного ключа кучи.
+
+    @param key Ключ, построенный _pack_key.
+    @return Стоимость как число с плавающей точкой.
+    """
+    return _F32_UNPACK((key >> 32).to_bytes(4, 'little'))[0]
+
+# Стрелки направлений по знаку смещения (d_row, d_col)
+_DIRECTION_ARROWS = {
+    (-1, 0): "↑",  # Вверх
+    (1, 0): "↓",   # Вниз
+    (0, -1): "←",  # Влево
+    (0, 1): "→",   # Вправо
+}
+
 class TerrainPathFinder(PathFinder):
     """
     @brief Класс для поиска пути в лабиринте с учетом стоимости перемещения.
@@ -47,10 +117,46 @@ class TerrainPathFinder(PathFinder):
         # Проверяем, что переданный лабиринт поддерживает методы для работы со стоимостью перемещения
         if not hasattr(maze, 'get_terrain_cost') or not hasattr(maze, 'is_passable'):
             raise ValueError("Переданный лабиринт должен поддерживать методы для работы со стоимостью перемещения")
-        
+
         super().__init__(maze)
-    
-    def dijkstra(self):
+
+        # Плотная сетка стоимостей клеток: TerrainMaze отдает готовый
+        # cost_grid, для прочих лабиринтов сетка строится один раз
+        # поэлементно. Внутренние циклы и вычисление стоимости пути
+        # читают массив вместо вызова get_terrain_cost на каждую клетку
+        cost = getattr(maze, 'cost_grid', None)
+        if cost is None:
+            cost = np.array(
+                [[maze.get_terrain_cost((i, j)) for j in range(maze.width)]
+                 for i in range(maze.height)], dtype=np.float32)
+        self._cell_cost = cost
+
+        # Байтовая маска проходимости: фильтр соседей во внутренних
+        # циклах - одно чтение байта вместо сравнения float с
+        # бесконечностью
+        self._passable = np.isfinite(cost).ravel()
+
+        # Списки-буферы приоритетных очередей, переиспользуемые между
+        # вызовами поиска: после первого прогрева очередь работает в
+        # готовом буфере без перевыделений списка
+        self._heap_buf = []
+        self._heap_buf_b = []
+
+        # Таблицы соседей по направлениям строятся лениво при первом
+        # поиске (см. _neighbor_table)
+        self._nbr_table = None
+
+        # Метки компонент связности проходимых клеток: строятся лениво
+        # при первом поиске (см. _components)
+        self._comp = None
+
+        # Кэш состояний поиска по базовой сетке: источник -> (prev,
+        # closed, признак полного обхода). Повторный запрос из того же
+        # источника к уже закрытой клетке восстанавливает путь за
+        # O(длины пути) без нового поиска
+        self._sssp_cache = {}
+
+    def dijkstra(self, start=None, end=None, race=None):
         """
         @brief Алгоритм Дейкстры для поиска кратчайшего пути с учетом стоимости перемещения.
         
@@ -69,85 +175,748 @@ class TerrainPathFinder(PathFinder):
               ii. Если найден путь с меньшей стоимостью, обновляем информацию о соседе.
         4. Если очередь опустела и конечная точка не найдена, возвращаем None.
         
+        @param start Кортеж (row, col) начальной позиции; None - старт лабиринта.
+        @param end Кортеж (row, col) конечной позиции; None - финиш лабиринта.
+        @param race Раса (класс или экземпляр Race), модификаторы которой учитываются
+                    при вычислении стоимости шагов. Если None, используется базовая
+                    стоимость местности.
+
         @return Список точек, представляющих найденный путь, или None, если путь не найден.
-        
+
         @throws Этот метод не вызывает исключений, но может вернуть None, если путь не найден.
-        
+
         @see https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm
         """
-        start = self.maze.get_start_position()
-        end = self.maze.get_end_position()
-        
+        if start is None:
+            start = self.maze.get_start_position()
+        if end is None:
+            end = self.maze.get_end_position()
+
         if not start or not end:
             return None
-            
-        # Приоритетная очередь для Дейкстры
-        # Формат элемента: (стоимость, позиция)
-        priority_queue = [(0, start)]
-        
-        # Словарь, содержащий текущую минимальную стоимость пути до каждой позиции
-        cost_so_far = {start: 0}
-        
-        # Словарь для восстановления пути
-        came_from = {start: None}
-        
-        while priority_queue:
-            # Извлекаем позицию с минимальной стоимостью
-            current_cost, current_pos = heapq.heappop(priority_queue)
-            
-            # Если мы достигли конечной точки, то путь найден
-            if current_pos == end:
+
+        # Предпроверка связности: если старт и финиш лежат в разных
+        # компонентах проходимых клеток, пути нет, и отрицательный ответ
+        # возвращается без исчерпывающего обхода сетки. Стартовая клетка
+        # не оплачивается, поэтому непроходимый старт соединен с
+        # компонентами своих соседей
+        if race is None and start != end:
+            width = self.maze.width
+            comp = self._components()
+            e_comp = comp[end[0] * width + end[1]]
+            if e_comp < 0:
+                return None
+            s_idx = start[0] * width + start[1]
+            s_comp = comp[s_idx]
+            if s_comp >= 0:
+                if s_comp != e_comp:
+                    return None
+            elif all(nbr[s_idx] < 0 or comp[nbr[s_idx]] != e_comp
+                     for nbr in self._neighbor_table()):
+                return None
+
+        # Предвычисленная сетка стоимостей: одно чтение из массива вместо
+        # двух вызовов методов на каждого соседа
+        if race is not None and hasattr(self.maze, 'get_cost_grid_for_race'):
+            cost_grid = self.maze.get_cost_grid_for_race(race)
+        else:
+            cost_grid = self._cell_cost
+
+        # Если доступна C-реализация, выполняем весь поиск вне интерпретатора
+        if _pathfinder_ctypes.is_available():
+            try:
+                return self._dijkstra_native(start, end, cost_grid)
+            except (RuntimeError, OSError):
+                # При любых проблемах с библиотекой возвращаемся к Python-реализации
+                pass
+
+        # Скомпилированное ядро выполняет весь цикл релаксаций вне
+        # интерпретатора и обрывает поиск на конечной клетке
+        if _dijkstra_path_nb is not None:
+            return self._dijkstra_numba(start, end, cost_grid)
+
+        # Сишная реализация из scipy: один вызов на запрос по
+        # предвычисленному CSR-графу
+        if _csgraph_dijkstra is not None:
+            return self._dijkstra_scipy(start, end, cost_grid)
+
+        # Квантованная int8-сетка уже содержит удвоенные целочисленные
+        # стоимости - используем ее напрямую, без повторной проверки
+        if race is None and getattr(self.maze, 'cost_grid_i8', None) is not None:
+            flat2 = self.maze.cost_grid_i8.astype(np.int64).ravel()
+            flat2[flat2 == TerrainMaze.IMPASSABLE_I8] = -1
+            return self._astar(start, end, flat2, cacheable=True)
+
+        # Если все стоимости кратны 0.5, переходим на упакованные целочисленные
+        # ключи кучи: ни одного кортежа в приоритетной очереди. Индекс
+        # клетки должен помещаться в отведенные _IDX_BITS бит ключа
+        scaled = cost_grid * 2.0
+        finite = np.isfinite(scaled)
+        if (self.maze.height * self.maze.width <= _IDX_MASK
+                and bool(np.all(scaled[finite] == np.rint(scaled[finite])))):
+            # Непроходимые клетки помечаются отрицательной стоимостью;
+            # кэш состояний поиска относится только к базовой сетке
+            flat2 = np.where(finite, np.rint(np.where(finite, scaled, 0)),
+                             -1).astype(np.int64).ravel()
+            return self._astar(start, end, flat2,
+                               cacheable=cost_grid is self._cell_cost)
+
+        # Для прочих вещественных сеток встречные волны от начала и конца
+        # исследуют примерно вдвое меньше клеток, чем один поиск
+        return self._bidijkstra(start, end, cost_grid)
+    
+    def _components(self):
+        """
+        @brief Возвращает метки компонент связности проходимых клеток.
+
+        @details
+        Плоский int32-массив: клетки одной компоненты несут одинаковую
+        метку, непроходимые клетки - метку -1. Если старт и финиш лежат
+        в разных компонентах, пути нет, и поиск можно не запускать
+        вовсе. Разметка выполняется один раз: через scipy.ndimage.label
+        (4-связность), а без scipy - обходом в ширину по таблицам
+        соседей.
+
+        @return Плоский массив numpy int32 длины height * width.
+        """
+        if self._comp is not None:
+            return self._comp
+
+        height, width = self.maze.height, self.maze.width
+        n = height * width
+
+        if _ndimage_label is not None:
+            labels, _ = _ndimage_label(self._passable.reshape(height, width))
+            # Фон (непроходимые клетки) размечен нулем - сдвигаем в -1
+            self._comp = labels.ravel().astype(np.int32) - 1
+            return self._comp
+
+        comp = np.full(n, -1, dtype=np.int32)
+        passable = self._passable
+        tables = self._neighbor_table()
+        next_label = 0
+
+        for seed in range(n):
+            if comp[seed] != -1 or not passable[seed]:
+                continue
+            comp[seed] = next_label
+            frontier = [seed]
+            while frontier:
+                current = frontier.pop()
+                for nbr in tables:
+                    neighbor = nbr[current]
+                    if (neighbor >= 0 and comp[neighbor] == -1
+                            and passable[neighbor]):
+                        comp[neighbor] = next_label
+                        frontier.append(neighbor)
+            next_label += 1
+
+        self._comp = comp
+        return comp
+
+    def _neighbor_table(self):
+        """
+        @brief Возвращает таблицы соседей по четырем направлениям.
+
+        @details
+        Для каждого направления таблица отображает плоский индекс клетки
+        в индекс соседа, -1 - выход за границу сетки. Таблицы строятся
+        одной векторной операцией на направление и переводятся в родные
+        списки: внутренние циклы заменяют деление на ширину и четыре
+        сравнения границ одним чтением из списка.
+
+        @return Кортеж из четырех списков длины height * width.
+        """
+        if self._nbr_table is None:
+            height, width = self.maze.height, self.maze.width
+            n = height * width
+            idx = np.arange(n, dtype=np.int64)
+            col = idx % width
+            self._nbr_table = (
+                np.where(idx >= width, idx - width, -1).tolist(),
+                np.where(idx < n - width, idx + width, -1).tolist(),
+                np.where(col > 0, idx - 1, -1).tolist(),
+                np.where(col < width - 1, idx + 1, -1).tolist(),
+            )
+        return self._nbr_table
+
+    def _build_csr(self, cost_grid):
+        """
+        @brief Строит CSR-представление графа лабиринта для C-реализации.
+
+        @details
+        Вершины нумеруются как row * width + col. Ребро u -> v с весом,
+        равным стоимости клетки v, создается для каждой пары соседних
+        проходимых клеток. Результат кэшируется до смены сетки стоимостей.
+
+        @param cost_grid Массив numpy со стоимостями клеток (inf - непроходимо).
+        @return Кортеж (indptr, indices, weights) - массивы int32/int32/float32.
+        """
+        # Для собственной сетки лабиринта представление предвычислено
+        # в TerrainMaze.__init__
+        if (cost_grid is getattr(self.maze, 'cost_grid', None)
+                and getattr(self.maze, 'adj_indptr', None) is not None):
+            return (self.maze.adj_indptr, self.maze.adj_indices,
+                    self.maze.adj_edge_cost)
+
+        if getattr(self, '_csr_grid', None) is cost_grid:
+            return self._csr
+
+        from terrain_maze import TerrainMaze
+        self._csr_grid = cost_grid
+        self._csr = TerrainMaze.build_adjacency_csr(cost_grid)
+
+        return self._csr
+
+    def _csr_with_start_edges(self, start_idx, cost_grid):
+        """
+        @brief Дополняет CSR-граф исходящими ребрами непроходимого старта.
+
+        @details
+        build_adjacency_csr создает ребра только между парами проходимых
+        клеток, поэтому у непроходимой стартовой клетки нет исходящих
+        ребер, хотя вход в нее не оплачивается и поиск из нее возможен
+        (см. предпроверку связности в dijkstra). Метод вставляет в
+        строку старта ребра к его проходимым соседям с весом, равным
+        стоимости входа в соседа. Кэшированные массивы не изменяются -
+        возвращаются копии на один запрос.
+
+        @param start_idx Плоский индекс стартовой клетки.
+        @param cost_grid Массив numpy со стоимостями клеток (inf - непроходимо).
+        @return Кортеж (indptr, indices, weights) - массивы int32/int32/float32.
+        """
+        indptr, indices, weights = self._build_csr(cost_grid)
+        flat = np.asarray(cost_grid, dtype=np.float32).ravel()
+
+        nbrs = np.array([nbr[start_idx] for nbr in self._neighbor_table()],
+                        dtype=np.int32)
+        nbrs = nbrs[nbrs >= 0]
+        nbrs = nbrs[np.isfinite(flat[nbrs])]
+        if nbrs.size == 0:
+            return indptr, indices, weights
+
+        cut = indptr[start_idx]
+        new_indptr = indptr.copy()
+        new_indptr[start_idx + 1:] += np.int32(nbrs.size)
+        new_indices = np.concatenate((indices[:cut], nbrs, indices[cut:]))
+        new_weights = np.concatenate((weights[:cut], flat[nbrs],
+                                      weights[cut:]))
+
+        return new_indptr, new_indices, new_weights
+
+    def _dijkstra_native(self, start, end, cost_grid):
+        """
+        @brief Поиск пути через C-реализацию алгоритма Дейкстры.
+
+        @param start Кортеж (row, col) начальной позиции.
+        @param end Кортеж (row, col) конечной позиции.
+        @param cost_grid Массив numpy со стоимостями клеток.
+        @return Список точек, представляющих найденный путь, или None, если путь не найден.
+        """
+        width = self.maze.width
+
+        start_idx = start[0] * width + start[1]
+        end_idx = end[0] * width + end[1]
+
+        # Стоимость входа в старт не оплачивается, поэтому поиск из
+        # непроходимой клетки допустим, но в кэшированном CSR у нее нет
+        # исходящих ребер - такой граф дополняется на один запрос
+        if np.isfinite(cost_grid[start[0], start[1]]):
+            indptr, indices, weights = self._build_csr(cost_grid)
+        else:
+            indptr, indices, weights = self._csr_with_start_edges(
+                start_idx, cost_grid)
+
+        _, came_from = _pathfinder_ctypes.dijkstra_csr(
+            indptr, indices, weights, start_idx, end_idx)
+
+        if came_from[end_idx] == -1 and end_idx != start_idx:
+            return None
+
+        # Восстанавливаем путь по массиву предшественников
+        return self._unpack_path(came_from, end_idx, width)
+
+    def _build_csgraph(self, cost_grid):
+        """
+        @brief Строит разреженную матрицу графа лабиринта для scipy.
+
+        @details
+        Оборачивает CSR-массивы из _build_csr в csr_matrix без
+        копирования данных; результат кэшируется до смены сетки
+        стоимостей.
+
+        @param cost_grid Массив numpy со стоимостями клеток (inf - непроходимо).
+        @return Матрица scipy.sparse.csr_matrix размера n x n.
+        """
+        if getattr(self, '_csgraph_grid', None) is cost_grid:
+            return self._csgraph
+
+        n = self.maze.height * self.maze.width
+        indptr, indices, weights = self._build_csr(cost_grid)
+        self._csgraph_grid = cost_grid
+        self._csgraph = _csr_matrix((weights, indices, indptr), shape=(n, n))
+
+        return self._csgraph
+
+    def _dijkstra_scipy(self, start, end, cost_grid):
+        """
+        @brief Поиск пути через scipy.sparse.csgraph.dijkstra.
+
+        @details
+        Весь поиск выполняется одним вызовом сишной реализации scipy по
+        предвычисленному CSR-графу; путь восстанавливается по массиву
+        предшественников (отрицательный страж scipy означает
+        недостижимую клетку).
+
+        @param start Кортеж (row, col) начальной позиции.
+        @param end Кортеж (row, col) конечной позиции.
+        @param cost_grid Массив numpy со стоимостями клеток.
+        @return Список точек, представляющих найденный путь, или None, если путь не найден.
+        """
+        width = self.maze.width
+
+        start_idx = start[0] * width + start[1]
+        end_idx = end[0] * width + end[1]
+
+        # Стоимость входа в старт не оплачивается, поэтому поиск из
+        # непроходимой клетки допустим, но в кэшированном CSR у нее нет
+        # исходящих ребер - такой граф дополняется на один запрос
+        if np.isfinite(cost_grid[start[0], start[1]]):
+            graph = self._build_csgraph(cost_grid)
+        else:
+            n = self.maze.height * width
+            indptr, indices, weights = self._csr_with_start_edges(
+                start_idx, cost_grid)
+            graph = _csr_matrix((weights, indices, indptr), shape=(n, n))
+
+        _, predecessors = _csgraph_dijkstra(
+            graph, directed=True, indices=start_idx,
+            return_predecessors=True)
+
+        if predecessors[end_idx] < 0 and end_idx != start_idx:
+            return None
+
+        # Страж scipy (-9999) приводится к -1, принятому в этом модуле
+        predecessors = predecessors.copy()
+        predecessors[predecessors < 0] = -1
+
+        return self._unpack_path(predecessors, end_idx, width)
+
+    def bidijkstra(self, start=None, end=None, race=None):
+        """
+        @brief Двунаправленный алгоритм Дейкстры между двумя точками.
+
+        @details
+        Волны запускаются одновременно от начальной и конечной точек и
+        останавливаются, когда сумма минимумов двух очередей достигает
+        стоимости лучшей найденной встречи: на равномерных сетках каждая
+        волна проходит примерно половину радиуса одиночного поиска.
+
+        @param start Кортеж (row, col) начальной позиции; None - старт лабиринта.
+        @param end Кортеж (row, col) конечной позиции; None - финиш лабиринта.
+        @param race Раса, модификаторы которой учитываются при вычислении
+                    стоимости шагов; None - базовая стоимость местности.
+        @return Список точек, представляющих найденный путь, или None, если путь не найден.
+        """
+        if start is None:
+            start = self.maze.get_start_position()
+        if end is None:
+            end = self.maze.get_end_position()
+        if not start or not end:
+            return None
+
+        if race is not None and hasattr(self.maze, 'get_cost_grid_for_race'):
+            cost_grid = self.maze.get_cost_grid_for_race(race)
+        else:
+            cost_grid = self._cell_cost
+
+        return self._bidijkstra(start, end, cost_grid)
+
+    def _bidijkstra(self, start, end, cost_grid):
+        """
+        @brief Реализация двунаправленного поиска по сетке стоимостей.
+
+        @details
+        Стоимость входа платится за клетку назначения, поэтому обратная
+        волна при шаге из клетки u в соседа платит стоимость самой u:
+        сумма dist_f[v] + dist_b[v] тогда равна полной стоимости пути
+        через v. Лучшая встреча пересчитывается на каждом ослаблении,
+        поиск завершается, когда минимумы обеих очередей в сумме не
+        могут ее улучшить.
+
+        @param start Кортеж (row, col) начальной позиции.
+        @param end Кортеж (row, col) конечной позиции.
+        @param cost_grid Массив numpy со стоимостями клеток.
+        @return Список точек, представляющих найденный путь, или None, если путь не найден.
+        """
+        height, width = self.maze.height, self.maze.width
+        n = height * width
+        flat = np.ascontiguousarray(cost_grid, dtype=np.float32).ravel()
+
+        # Маска проходимости сетки; для собственной сетки лабиринта
+        # она предвычислена в __init__
+        if cost_grid is self._cell_cost:
+            passable = self._passable
+        else:
+            passable = np.isfinite(flat)
+
+        start_idx = start[0] * width + start[1]
+        end_idx = end[0] * width + end[1]
+
+        if start_idx == end_idx:
+            return [start]
+        if not passable[end_idx]:
+            return None
+
+        inf = float('inf')
+        nbr_up, nbr_down, nbr_left, nbr_right = self._neighbor_table()
+        dist_f = np.full(n, np.inf, dtype=np.float32)
+        dist_b = np.full(n, np.inf, dtype=np.float32)
+        prev_f = np.full(n, -1, dtype=np.int32)
+        prev_b = np.full(n, -1, dtype=np.int32)
+        closed_f = np.zeros(n, dtype=np.bool_)
+        closed_b = np.zeros(n, dtype=np.bool_)
+
+        dist_f[start_idx] = 0.0
+        dist_b[end_idx] = 0.0
+        # Очереди хранят упакованные ключи (биты float32 << 32) | индекс
+        # в переиспользуемых буферах: одно целочисленное сравнение вместо
+        # сравнения кортежей и ни одного перевыделения списка
+        heap_f = self._heap_buf
+        heap_b = self._heap_buf_b
+        len_f = heap4.push_into(heap_f, 0, start_idx)
+        len_b = heap4.push_into(heap_b, 0, end_idx)
+
+        # Стоимость лучшей встречи волн и клетка, где она произошла
+        mu = inf
+        meet = -1
+
+        while len_f and len_b:
+            top_f = _key_cost(heap_f[0])
+            top_b = _key_cost(heap_b[0])
+            if top_f + top_b >= mu:
                 break
-                
-            # Если текущая стоимость больше, чем известная минимальная, пропускаем
-            if current_cost > cost_so_far[current_pos]:
+
+            # Расширяется волна с меньшим минимумом очереди
+            forward = top_f <= top_b
+            if forward:
+                heap, heap_len = heap_f, len_f
+                dist, closed, prev = dist_f, closed_f, prev_f
+                other = dist_b
+            else:
+                heap, heap_len = heap_b, len_b
+                dist, closed, prev = dist_b, closed_b, prev_b
+                other = dist_f
+
+            key, heap_len = heap4.pop_from(heap, heap_len)
+            current_idx = key & 0xFFFFFFFF
+            if closed[current_idx]:
+                if forward:
+                    len_f = heap_len
+                else:
+                    len_b = heap_len
                 continue
-                
-            # Проверяем все соседние позиции
-            for next_pos in self.maze.get_neighbors(current_pos):
-                # Вычисляем новую стоимость пути
-                new_cost = current_cost + self.maze.get_terrain_cost(next_pos)
-                
-                # Если мы нашли новый лучший путь до next_pos или это первый найденный путь
-                if next_pos not in cost_so_far or new_cost < cost_so_far[next_pos]:
-                    cost_so_far[next_pos] = new_cost
-                    heapq.heappush(priority_queue, (new_cost, next_pos))
-                    came_from[next_pos] = current_pos
-        
+            closed[current_idx] = True
+            current_cost = float(dist[current_idx])
+
+            # Обратная волна платит за выход из текущей клетки; если он
+            # непроходим, ни одна релаксация не уменьшит расстояние
+            if not forward and not passable[current_idx]:
+                len_b = heap_len
+                continue
+
+            step_back = float(flat[current_idx])
+
+            # Соседи читаются из предвычисленных таблиц направлений:
+            # ни деления на ширину, ни сравнений границ в горячем цикле
+            for next_idx in (nbr_up[current_idx], nbr_down[current_idx],
+                             nbr_left[current_idx], nbr_right[current_idx]):
+                if next_idx < 0 or closed[next_idx]:
+                    continue
+
+                # Прямая волна платит за вход в соседа: проходимость
+                # соседа проверяется одним чтением байта из маски
+                if forward:
+                    if not passable[next_idx]:
+                        continue
+                    step = float(flat[next_idx])
+                else:
+                    step = step_back
+
+                new_cost = current_cost + step
+                if new_cost < dist[next_idx]:
+                    dist[next_idx] = new_cost
+                    prev[next_idx] = current_idx
+                    heap_len = heap4.push_into(heap, heap_len,
+                                               _pack_key(new_cost, next_idx))
+
+                # Проверка встречи по лучшим известным оценкам обеих волн
+                total = float(dist[next_idx]) + float(other[next_idx])
+                if total < mu:
+                    mu = total
+                    meet = next_idx
+
+            if forward:
+                len_f = heap_len
+            else:
+                len_b = heap_len
+
+        if meet == -1:
+            return None
+
+        # Сшиваем путь в точке встречи: prev_f ведет к старту, prev_b - к финишу
+        path = []
+        current_idx = meet
+        while current_idx != -1:
+            path.append(divmod(current_idx, width))
+            current_idx = int(prev_f[current_idx])
+        path.reverse()
+
+        current_idx = int(prev_b[meet])
+        while current_idx != -1:
+            path.append(divmod(current_idx, width))
+            current_idx = int(prev_b[current_idx])
+
+        return path
+
+    def _dijkstra_numba(self, start, end, cost_grid):
+        """
+        @brief Поиск пути скомпилированным ядром Дейкстры.
+
+        @param start Кортеж (row, col) начальной позиции.
+        @param end Кортеж (row, col) конечной позиции.
+        @param cost_grid Массив numpy со стоимостями клеток.
+        @return Список точек, представляющих найденный путь, или None, если путь не найден.
+        """
+        height, width = self.maze.height, self.maze.width
+
+        start_idx = start[0] * width + start[1]
+        end_idx = end[0] * width + end[1]
+
+        prev, _ = _dijkstra_path_nb(
+            np.ascontiguousarray(cost_grid, dtype=np.float32).ravel(),
+            height, width, start_idx, end_idx)
+
+        if prev[end_idx] == -1 and end_idx != start_idx:
+            return None
+
+        # Восстанавливаем путь по массиву предшественников
+        return self._unpack_path(prev, end_idx, width)
+
+    def _astar(self, start, end, flat2, cacheable=False):
+        """
+        @brief Поиск A* с упакованными целочисленными ключами кучи.
+
+        @details
+        Каждый элемент приоритетной очереди - одно целое число вида
+        (оценка << _IDX_BITS) | индекс_клетки, где оценка - удвоенная
+        стоимость пути плюс допустимая эвристика: манхэттенское
+        расстояние до конечной клетки, умноженное на минимальный шаг
+        сетки. Эвристика согласована (шаг уменьшает манхэттенское
+        расстояние не более чем на 1 и стоит не меньше минимального
+        шага), поэтому ранний выход при извлечении конечной клетки
+        сохраняет оптимальность, а волна вытягивается к цели вместо
+        равномерного расширения. Все состояние поиска лежит в плоских
+        списках, индексируемых номером клетки: расстояния,
+        предшественники и признак обработанности читаются одним
+        обращением к списку вместо хеширования кортежей в словарях.
+
+        @param start Кортеж (row, col) начальной позиции.
+        @param end Кортеж (row, col) конечной позиции.
+        @param flat2 Плоский массив numpy с удвоенными целочисленными
+                     стоимостями клеток; отрицательное значение -
+                     непроходимая клетка.
+        @param cacheable Если True, состояние поиска сохраняется в кэше
+                         по источнику и переиспользуется повторными
+                         запросами; допустимо только для неизменной
+                         базовой сетки стоимостей.
+        @return Список точек, представляющих найденный путь, или None, если путь не найден.
+        """
+        height, width = self.maze.height, self.maze.width
+        n = height * width
+
+        start_idx = start[0] * width + start[1]
+        end_idx = end[0] * width + end[1]
+
+        # Совпадающие старт и финиш не требуют ни поиска, ни кэша
+        if start_idx == end_idx:
+            return [start]
+
+        # Повторный запрос из уже исследованного источника: если конечная
+        # клетка была закрыта прошлым поиском (или обход был полным),
+        # расстояния и предшественники точны и путь восстанавливается
+        # без нового поиска
+        if cacheable:
+            cached = self._sssp_cache.get(start_idx)
+            if cached is not None:
+                prev_c, closed_c, exhausted = cached
+                if closed_c[end_idx] or exhausted:
+                    if prev_c[end_idx] == -1:
+                        return None
+                    return self._unpack_path(prev_c, end_idx, width)
+
+        # Минимальный удвоенный шаг сетки для эвристики; на сетке без
+        # положительных стоимостей эвристика нулевая и поиск вырождается
+        # в обычную Дейкстру
+        positive = flat2[flat2 > 0]
+        min_step2 = int(positive.min()) if positive.size else 0
+
+        # Эвристика всех клеток вычисляется одной широковещательной
+        # операцией до начала поиска: в горячем цикле остается чтение
+        # готового значения по индексу соседа
+        er, ec = end
+        h_rows = np.abs(np.arange(height, dtype=np.int64) - er)
+        h_cols = np.abs(np.arange(width, dtype=np.int64) - ec)
+        h_flat = (min_step2 * (h_rows[:, None] + h_cols[None, :])).ravel().tolist()
+
+        nbr_up, nbr_down, nbr_left, nbr_right = self._neighbor_table()
+
+        # Состояние поиска в родных списках (структура массивов вместо
+        # словарей позиций): чтение элемента списка не распаковывает
+        # numpy-скаляр, поэтому горячий цикл работает с целыми числами
+        # интерпретатора напрямую. dist хранит точную стоимость пути,
+        # эвристика входит только в ключи очереди
+        steps = flat2.tolist()
+        dist = [_UNREACHED] * n
+        prev = [-1] * n
+        closed = [False] * n
+
+        dist[start_idx] = 0
+
+        # Приоритетная очередь из "голых" целых чисел в переиспользуемом
+        # буфере: между вызовами поиска список не перевыделяется
+        priority_queue = self._heap_buf
+        queue_len = heap4.push_into(priority_queue, 0, start_idx)
+        found = False
+
+        while queue_len:
+            key, queue_len = heap4.pop_from(priority_queue, queue_len)
+            current_idx = key & _IDX_MASK
+
+            # Если мы достигли конечной точки, то путь найден; клетка
+            # закрывается, чтобы кэш состояний знал о ее точности
+            if current_idx == end_idx:
+                closed[current_idx] = True
+                found = True
+                break
+
+            # Устаревшие записи очереди (ленивое удаление)
+            if closed[current_idx]:
+                continue
+            closed[current_idx] = True
+
+            current_cost = dist[current_idx]
+
+            # Соседи читаются из предвычисленных таблиц направлений,
+            # эвристика - из готового поля; проходимость проверяется
+            # по знаку стоимости внутри _relax
+            for next_idx in (nbr_up[current_idx], nbr_down[current_idx],
+                             nbr_left[current_idx], nbr_right[current_idx]):
+                if next_idx >= 0:
+                    queue_len = self._relax(
+                        next_idx, current_cost, current_idx, h_flat[next_idx],
+                        steps, dist, prev, closed, priority_queue, queue_len)
+
+        # Полный обход - только когда очередь иссякла сама: ранний выход
+        # на конечной клетке оставляет ее соседей нерелаксированными,
+        # и такое состояние отвечает лишь за уже закрытые клетки
+        if cacheable:
+            self._sssp_cache[start_idx] = (prev, closed,
+                                           queue_len == 0 and not found)
+
         # Если мы не достигли конечной точки, то путь не найден
-        if end not in came_from:
+        if prev[end_idx] == -1:
             return None
-            
-        # Восстанавливаем путь
+
+        # Восстанавливаем путь, распаковывая индексы обратно в координаты
+        return self._unpack_path(prev, end_idx, width)
+
+    @staticmethod
+    def _unpack_path(prev, end_idx, width):
+        """
+        @brief Восстанавливает путь по массиву предшественников.
+
+        @param prev Плоский массив предшественников (-1 - начало цепочки).
+        @param end_idx Плоский индекс конечной клетки.
+        @param width Ширина сетки для распаковки индексов в координаты.
+        @return Список точек от начала цепочки к конечной клетке.
+        """
         path = []
-        current = end
-        
-        while current:
-            path.append(current)
-            current = came_from[current]
-            
-        # Переворачиваем путь, чтобы он шел от начала к концу
+        current_idx = int(end_idx)
+
+        while current_idx != -1:
+            path.append(divmod(current_idx, width))
+            current_idx = int(prev[current_idx])
+
         path.reverse()
-        
+
         return path
-    
+
+    @staticmethod
+    def _relax(next_idx, current_cost, current_idx, heuristic, steps, dist,
+               prev, closed, priority_queue, queue_len):
+        """
+        @brief Релаксация одного ребра для _astar.
+
+        @param next_idx Плоский индекс соседней клетки.
+        @param current_cost Целочисленная стоимость пути до текущей клетки.
+        @param current_idx Плоский индекс текущей клетки.
+        @param heuristic Целочисленная эвристическая оценка пути от
+                         соседней клетки до конечной.
+        @param steps Список целочисленных стоимостей клеток.
+        @param dist Список текущих минимальных стоимостей.
+        @param prev Список предшественников.
+        @param closed Список признаков обработанности клеток.
+        @param priority_queue Список-буфер 4-арной кучи упакованных ключей.
+        @param queue_len Текущее число элементов кучи.
+        @return Новое число элементов кучи.
+        """
+        if closed[next_idx]:
+            return queue_len
+        step = steps[next_idx]
+        if step < 0:
+            return queue_len
+        new_cost = current_cost + step
+        if new_cost < dist[next_idx]:
+            dist[next_idx] = new_cost
+            prev[next_idx] = current_idx
+            return heap4.push_into(
+                priority_queue, queue_len,
+                ((new_cost + heuristic) << _IDX_BITS) | next_idx)
+        return queue_len
+
+    def get_path_costs_array(self, path):
+        """
+        @brief Возвращает стоимости шагов пути одним массивом numpy.
+
+        @details
+        Стоимости собираются одной векторной выборкой из сетки: стартовая
+        клетка не оплачивается, поэтому элемент i массива - стоимость
+        входа в клетку path[i + 1]. Вызывающий код может суммировать,
+        искать максимум или строить префиксные суммы без цикла по точкам.
+
+        @param path Список точек, представляющих путь.
+        @return Массив numpy стоимостей шагов (пустой для пути короче двух точек).
+        """
+        if not path or len(path) < 2:
+            return np.empty(0, dtype=self._cell_cost.dtype)
+
+        arr = np.asarray(path, dtype=np.int32)
+        return self._cell_cost[arr[1:, 0], arr[1:, 1]]
+
     def get_path_cost(self, path):
         """
         @brief Вычисляет общую стоимость пути.
-        
+
         @param path Список точек, представляющих путь.
         @return Число, представляющее общую стоимость пути.
         """
         if not path or len(path) < 2:
             return 0
-            
-        total_cost = 0
-        
-        # Суммируем стоимость прохождения через каждую точку пути, кроме начальной
-        for i in range(1, len(path)):
-            total_cost += self.maze.get_terrain_cost(path[i])
-            
-        return total_cost
+
+        # Одно векторное суммирование вместо цикла по точкам пути;
+        # бесконечная стоимость любой клетки естественно дает inf
+        return float(self.get_path_costs_array(path).sum())
     
     def get_path_directions_with_costs(self, path):
         """
@@ -158,27 +927,14 @@ class TerrainPathFinder(PathFinder):
         """
         if not path or len(path) < 2:
             return []
-            
-        directions = []
-        
-        # Определяем направление для каждого шага
-        for i in range(len(path) - 1):
-            current_row, current_col = path[i]
-            next_row, next_col = path[i+1]
-            
-            # Определяем направление
-            if next_row < current_row:
-                direction = "↑"  # Вверх
-            elif next_row > current_row:
-                direction = "↓"  # Вниз
-            elif next_col < current_col:
-                direction = "←"  # Влево
-            else:
-                direction = "→"  # Вправо
-                
-            # Получаем стоимость шага
-            cost = self.maze.get_terrain_cost(path[i+1])
-            
-            directions.append((direction, cost))
-            
-        return directions 
\ No newline at end of file
+
+        arr = np.asarray(path, dtype=np.int32)
+
+        # Направления и стоимости вычисляются одной векторной операцией;
+        # tolist переводит результаты в родные int/float разом, без
+        # распаковки numpy-скаляров на каждом шаге
+        deltas = np.sign(np.diff(arr, axis=0)).tolist()
+        costs = self.get_path_costs_array(path).astype(float).tolist()
+
+        return [(_DIRECTION_ARROWS.get((dr, dc), "→"), cost)
+                for (dr, dc), cost in zip(deltas, costs)] 
\ No newline at end of file
@@ -11,7 +11,44 @@
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 import numpy as np
-from matplotlib.cm import get_cmap
+from matplotlib.collections import LineCollection
+from matplotlib.colors import ListedColormap
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _blend_paths_py(img, rows, cols, color, alpha):
+    """
+    Подмешивает цвет пути в uint8 RGB-массив (запасная реализация на NumPy).
+
+    Args:
+        img: Массив numpy (H, W, 3) с цветами лабиринта.
+        rows: Массив индексов строк клеток пути.
+        cols: Массив индексов столбцов клеток пути.
+        color: Массив из трех компонент цвета пути.
+        alpha: Доля цвета пути в смеси (0..1).
+    """
+    blended = (1.0 - alpha) * img[rows, cols] + alpha * color
+    img[rows, cols] = blended.astype(img.dtype)
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _blend_paths(img, rows, cols, color, alpha):
+        """JIT-ядро подмешивания цвета пути в RGB-массив."""
+        for k in range(rows.shape[0]):
+            r, c = rows[k], cols[k]
+            for ch in range(3):
+                img[r, c, ch] = np.uint8((1.0 - alpha) * img[r, c, ch]
+                                         + alpha * color[ch])
+else:
+    _blend_paths = _blend_paths_py
+
 
 class TerrainVisualizer:
     """
@@ -72,69 +109,321 @@ class TerrainVisualizer:
         """
         self.maze = maze
         self.figsize = figsize
-        
-    def get_colored_maze(self):
+
+        # Максимальная сторона изображения (в клетках), передаваемого imshow;
+        # более крупные лабиринты прореживаются перед отрисовкой
+        self.max_side = 2000
+
+        # Таблица цветов, индексируемая кодом символа местности.
+        # Для неизвестных символов используется серый цвет. Хранится в
+        # uint8 RGB: imshow принимает такой массив по быстрому пути и
+        # без конвертации в float64
+        self._color_lut = np.full((256, 3), 204, dtype=np.uint8)
+        for key, value in self.TERRAIN_COLORS.items():
+            self._color_lut[ord(key)] = [int(round(c * 255))
+                                         for c in mcolors.to_rgb(value)]
+
+        # Категориальный маршрут отрисовки: коды символов сжимаются в
+        # плотные индексы категорий, а цвета применяет сам imshow через
+        # ListedColormap (наложение colormap выполняется в C)
+        palette = list(self.TERRAIN_COLORS.values()) + ['#CCCCCC']
+        self._terrain_cmap = ListedColormap(palette)
+        self._code_to_cat = np.full(256, len(palette) - 1, dtype=np.uint8)
+        for cat, key in enumerate(self.TERRAIN_COLORS):
+            self._code_to_cat[ord(key)] = cat
+
+        # Кэш раскрашенного лабиринта: сетка почти никогда не меняется
+        # между вызовами display_*, поэтому пересчитывать ее не нужно
+        self._cached_maze = None
+        self._cache_key = None
+
+        # Лениво заполняемые размеры лабиринта и массивы делений сетки:
+        # np.arange на каждый вызов display_* заметен для больших лабиринтов
+        self._dims_cache = None
+        self._xticks = None
+        self._yticks = None
+
+        # Постоянные артисты маркеров и подписей героев: при повторной
+        # отрисовке на тех же осях обновляются координаты вместо
+        # пересоздания артистов (см. _upsert_heroes)
+        self._hero_artists = {}
+
+        # Постоянная фигура и сохраненный фон для покадровой отрисовки
+        # пути через blitting (см. display_path_frame)
+        self._persistent_fig = None
+        self._persistent_ax = None
+        self._path_artist = None
+        self._frame_scale = 1
+        self._bg = None
+
+        # Базовые элементы легенды (типы местности) создаются один раз;
+        # методы display_* добавляют к копии списка своих героев и пути
+        self._base_legend = [Patch(facecolor=self.TERRAIN_COLORS[key],
+                                   edgecolor='black',
+                                   label=self.TERRAIN_NAMES[key])
+                             for key in self.TERRAIN_NAMES]
+
+    def invalidate_cache(self):
+        """
+        @brief Сбрасывает кэш раскрашенного лабиринта.
+
+        @details
+        Вызывается, если сетка лабиринта была изменена программно и
+        закэшированная цветовая карта устарела.
+        """
+        self._cached_maze = None
+        self._cache_key = None
+        self._dims_cache = None
+        self._xticks = None
+        self._yticks = None
+
+    @property
+    def _dims(self):
+        """
+        @brief Размеры лабиринта (высота, ширина) с ленивым кэшированием.
+
+        @return Кортеж (высота, ширина) лабиринта.
+        """
+        if self._dims_cache is None:
+            grid = self.maze.get_grid()
+            self._dims_cache = (len(grid), len(grid[0]))
+        return self._dims_cache
+
+    @property
+    def _H(self):
+        """@brief Высота лабиринта в клетках."""
+        return self._dims[0]
+
+    @property
+    def _W(self):
+        """@brief Ширина лабиринта в клетках."""
+        return self._dims[1]
+
+    def _for_display(self, colored_maze):
+        """
+        @brief Прореживает цветовую карту до разумного размера для imshow.
+
+        @details
+        Клетки, которые все равно не разрешимы на экране, не имеет смысла
+        растеризовывать: для лабиринтов крупнее self.max_side берется каждый
+        s-й пиксель. Координаты маркеров поверх изображения нужно делить
+        на возвращенный коэффициент.
+
+        @param colored_maze Массив numpy (H, W, 3) с цветами лабиринта.
+        @return Кортеж (массив для отображения, коэффициент прореживания s).
+        """
+        scale = max(1, int(np.ceil(max(colored_maze.shape[:2]) / self.max_side)))
+        if scale == 1:
+            return colored_maze, 1
+        return colored_maze[::scale, ::scale], scale
+
+    def _grid_codes(self):
+        """
+        @brief Преобразует сетку лабиринта в массив кодов символов.
+
+        @return Двумерный массив numpy (uint8) с кодами символов местности.
+        """
+        # TerrainMaze уже хранит категориальное представление сетки,
+        # построенное один раз при создании лабиринта
+        codes = getattr(self.maze, 'grid_codes', None)
+        if codes is not None:
+            return codes
+
+        grid = self.maze.get_grid()
+        height, width = len(grid), len(grid[0])
+
+        if isinstance(grid[0], str):
+            # Список строк упаковывается в байты без обхода клеток в Python
+            return np.frombuffer(''.join(grid).encode('latin-1'),
+                                 dtype=np.uint8).reshape(height, width)
+
+        codes = np.zeros((height, width), dtype=np.uint8)
+        for i, row in enumerate(grid):
+            for j, cell in enumerate(row):
+                if isinstance(cell, str) and len(cell) == 1:
+                    codes[i, j] = ord(cell)
+
+        return codes
+
+    def get_colored_maze(self, copy=True):
         """
         @brief Создает цветовую карту лабиринта.
-        
+
+        @details
+        Цвет каждой клетки берется из предвычисленной таблицы по коду
+        символа местности - одна векторная выборка вместо двойного цикла
+        по клеткам.
+
+        Результат кэшируется по идентичности сетки и дешевому отпечатку
+        (размеры плюс первая и последняя строки); повторные вызовы
+        возвращают копию закэшированного массива.
+
         @return Двумерный массив numpy с цветами для каждой ячейки лабиринта.
         """
         grid = self.maze.get_grid()
-        height, width = len(grid), len(grid[0])
-        
-        # Создаем массив для цветов
-        colored_maze = np.zeros((height, width, 3))
-        
-        # Заполняем массив цветами в зависимости от типа местности
-        for i in range(height):
-            for j in range(width):
-                cell_type = grid[i][j]
-                if cell_type in self.TERRAIN_COLORS:
-                    color = mcolors.to_rgb(self.TERRAIN_COLORS[cell_type])
-                else:
-                    # Если тип местности не определен, используем серый цвет
-                    color = mcolors.to_rgb('#CCCCCC')
-                    
-                colored_maze[i, j] = color
-        
-        return colored_maze
+        key = (id(grid), len(grid), len(grid[0]),
+               hash(tuple(grid[0])), hash(tuple(grid[-1])))
+
+        # По умолчанию возвращаем копию, так как вызывающие методы
+        # (display_path и др.) модифицируют массив при наложении путей;
+        # copy=False дает кэшированный массив без затрат на копирование
+        if key != self._cache_key:
+            self._cached_maze = self._color_lut[self._grid_codes()]
+            self._cache_key = key
+
+        return self._cached_maze.copy() if copy else self._cached_maze
         
-    def display_maze(self, title="Лабиринт с различными типами местности"):
+    def _setup_axes(self, ax):
+        """
+        @brief Настраивает оси под клеточное изображение лабиринта.
+
+        @details
+        Для очень больших лабиринтов линии сетки тоньше одного пикселя и
+        только раздувают число артистов, поэтому сетка рисуется лишь для
+        лабиринтов со стороной не более 500 клеток.
+
+        @param ax Оси matplotlib, на которых отрисован лабиринт.
+        """
+        ax.set_aspect('equal')
+        if max(self._H, self._W) <= 500:
+            if self._xticks is None:
+                self._xticks = np.arange(-0.5, self._W, 1)
+                self._yticks = np.arange(-0.5, self._H, 1)
+            ax.grid(which='major', axis='both', linestyle='-', color='k', linewidth=0.5)
+            ax.set_xticks(self._xticks, minor=True)
+            ax.set_yticks(self._yticks, minor=True)
+        ax.set_xticklabels([])
+        ax.set_yticklabels([])
+        ax.tick_params(axis='both', which='both', length=0)
+
+    def _finish_figure(self, fig, save_path, block):
+        """
+        @brief Завершает отрисовку фигуры: сохранение или показ.
+
+        @details
+        При заданном save_path фигура сохраняется и сразу закрывается,
+        не блокируя вызывающий код на оконном цикле; block=False
+        показывает окно без ожидания.
+
+        @param fig Фигура matplotlib.
+        @param save_path Путь к файлу для сохранения или None.
+        @param block Ожидать ли закрытия окна при показе.
+        """
+        plt.tight_layout()
+        if save_path:
+            fig.savefig(save_path)
+            plt.close(fig)
+        elif block:
+            plt.show()
+        else:
+            plt.show(block=False)
+
+    def render_batch(self, tasks):
+        """
+        @brief Пакетно сохраняет набор визуализаций в файлы.
+
+        @details
+        На время работы matplotlib переключается на безоконный бэкенд
+        Agg, поэтому пакет можно рендерить без дисплея (например, в
+        фоновом процессе), не упираясь в синхронный plt.show().
+
+        @param tasks Список кортежей (имя метода display_*, args, kwargs);
+                     kwargs каждого вызова должен содержать save_path.
+        """
+        import matplotlib
+        previous = matplotlib.get_backend()
+        matplotlib.use('Agg', force=True)
+        try:
+            for name, args, kwargs in tasks:
+                getattr(self, name)(*args, **kwargs)
+        finally:
+            matplotlib.use(previous, force=True)
+
+    def display_path_frame(self, path):
+        """
+        @brief Быстро перерисовывает путь поверх постоянной фигуры (blitting).
+
+        @details
+        Для анимации промежуточных состояний поиска создавать фигуру и
+        заново растеризовывать лабиринт на каждый кадр слишком дорого.
+        Первый вызов отрисовывает базовую карту и запоминает ее фон;
+        последующие восстанавливают фон и перерисовывают только артист
+        пути через canvas.blit.
+
+        @param path Список точек (row, col), представляющих путь.
+        """
+        if self._persistent_fig is None:
+            fig, ax = plt.subplots(figsize=self.figsize)
+            display_arr, scale = self._for_display(self.get_colored_maze())
+            ax.imshow(display_arr, interpolation='nearest', rasterized=True)
+            self._setup_axes(ax)
+            (artist,) = ax.plot([], [], 'o-', color='red', linewidth=2,
+                                markersize=4, animated=True)
+            fig.canvas.draw()
+            self._persistent_fig = fig
+            self._persistent_ax = ax
+            self._path_artist = artist
+            self._frame_scale = scale
+            self._bg = fig.canvas.copy_from_bbox(ax.bbox)
+
+        fig, ax = self._persistent_fig, self._persistent_ax
+        fig.canvas.restore_region(self._bg)
+        if path:
+            arr = np.asarray(path, dtype=np.float64) / self._frame_scale
+            self._path_artist.set_data(arr[:, 1], arr[:, 0])
+        else:
+            self._path_artist.set_data([], [])
+        ax.draw_artist(self._path_artist)
+        fig.canvas.blit(ax.bbox)
+        fig.canvas.flush_events()
+
+    def reset_animation(self):
+        """
+        @brief Сбрасывает постоянную фигуру и фон, используемые blitting-ом.
+
+        @details
+        Вызывается после изменения лабиринта или закрытия окна анимации;
+        следующий display_path_frame построит фигуру заново.
+        """
+        if self._persistent_fig is not None:
+            plt.close(self._persistent_fig)
+        self._persistent_fig = None
+        self._persistent_ax = None
+        self._path_artist = None
+        self._bg = None
+
+    def display_maze(self, title="Лабиринт с различными типами местности",
+                     block=True, save_path=None):
         """
         @brief Отображает лабиринт с различными типами местности.
         
         @param title Заголовок для графического изображения.
         """
-        colored_maze = self.get_colored_maze()
-        
+        # Без наложения путей достаточно категориальной сетки:
+        # один uint8-индекс на клетку вместо RGB-массива
+        categories = self._code_to_cat[self._grid_codes()]
+
         fig, ax = plt.subplots(figsize=self.figsize)
-        ax.imshow(colored_maze, interpolation='nearest')
+        display_arr, scale = self._for_display(categories)
+        ax.imshow(display_arr, cmap=self._terrain_cmap, vmin=0,
+                  vmax=self._terrain_cmap.N - 1,
+                  interpolation='nearest', rasterized=True)
         
-        # Добавляем сетку для более четкого отображения ячеек
-        ax.grid(which='major', axis='both', linestyle='-', color='k', linewidth=0.5)
-        ax.set_xticks(np.arange(-0.5, len(self.maze.get_grid()[0]), 1), minor=True)
-        ax.set_yticks(np.arange(-0.5, len(self.maze.get_grid()), 1), minor=True)
-        ax.set_xticklabels([])
-        ax.set_yticklabels([])
-        ax.tick_params(axis='both', which='both', length=0)
+        self._setup_axes(ax)
         
         # Добавляем заголовок
         plt.title(title)
         
         # Добавляем легенду
-        from matplotlib.patches import Patch
-        legend_elements = [Patch(facecolor=self.TERRAIN_COLORS[key], 
-                                edgecolor='black',
-                                label=self.TERRAIN_NAMES[key]) 
-                          for key in self.TERRAIN_NAMES]
-        
-        ax.legend(handles=legend_elements, loc='upper center', 
+        legend_elements = list(self._base_legend)
+
+        ax.legend(handles=legend_elements, loc='upper center',
                  bbox_to_anchor=(0.5, -0.05), ncol=3, fontsize=8)
-        
-        plt.tight_layout()
-        plt.show()
-        
-    def display_path(self, path, title="Оптимальный путь с учетом типов местности"):
+
+        self._finish_figure(fig, save_path, block)
+
+    def display_path(self, path, title="Оптимальный путь с учетом типов местности",
+                     block=True, save_path=None):
         """
         @brief Отображает лабиринт с выделенным путем.
         
@@ -145,46 +434,88 @@ class TerrainVisualizer:
             print("Путь не найден!")
             return
             
-        colored_maze = self.get_colored_maze()
-        
-        # Отмечаем путь красным цветом
-        for row, col in path:
-            # Делаем путь более заметным, смешивая его с красным цветом
-            colored_maze[row, col] = np.array([1.0, 0.0, 0.0])  # Красный
-            
+        # Для огромных лабиринтов путь рисуется разреженным артистом
+        # поверх базовой карты: копировать и мутировать массив H x W x 3
+        # ради нескольких клеток пути расточительно
+        arr = np.asarray(path, dtype=np.intp)
+        sparse_overlay = self._H * self._W > 1_000_000
+
+        colored_maze = self.get_colored_maze(copy=not sparse_overlay)
+        if not sparse_overlay:
+            # Отмечаем путь красным цветом одним векторным присваиванием;
+            # колорированная копия принадлежит только нам
+            colored_maze[arr[:, 0], arr[:, 1]] = (255, 0, 0)
+
         fig, ax = plt.subplots(figsize=self.figsize)
-        ax.imshow(colored_maze, interpolation='nearest')
-        
-        # Добавляем сетку
-        ax.grid(which='major', axis='both', linestyle='-', color='k', linewidth=0.5)
-        ax.set_xticks(np.arange(-0.5, len(self.maze.get_grid()[0]), 1), minor=True)
-        ax.set_yticks(np.arange(-0.5, len(self.maze.get_grid()), 1), minor=True)
-        ax.set_xticklabels([])
-        ax.set_yticklabels([])
-        ax.tick_params(axis='both', which='both', length=0)
+        display_arr, scale = self._for_display(colored_maze)
+        ax.imshow(display_arr, interpolation='nearest', rasterized=True)
+
+        if sparse_overlay:
+            self._draw_path_overlay(ax, arr.astype(np.float64) / scale, 'red')
+
+        self._setup_axes(ax)
         
         # Добавляем заголовок
         plt.title(title)
         
         # Добавляем легенду
-        from matplotlib.patches import Patch
-        legend_elements = [Patch(facecolor=self.TERRAIN_COLORS[key], 
-                                edgecolor='black',
-                                label=self.TERRAIN_NAMES[key]) 
-                          for key in self.TERRAIN_NAMES]
-        
-        legend_elements.append(Patch(facecolor='red', 
+        legend_elements = list(self._base_legend)
+
+        legend_elements.append(Patch(facecolor='red',
                                     edgecolor='black',
                                     label='Путь'))
         
         ax.legend(handles=legend_elements, loc='upper center', 
                  bbox_to_anchor=(0.5, -0.05), ncol=3, fontsize=8)
         
-        plt.tight_layout()
-        plt.show()
+        self._finish_figure(fig, save_path, block)
         
+    def _draw_path_overlay(self, ax, pts, color):
+        """
+        @brief Рисует путь отдельным артистом поверх изображения лабиринта.
+
+        @param ax Оси matplotlib, на которых отрисован лабиринт.
+        @param pts Массив numpy (N, 2) точек пути в координатах (row, col).
+        @param color Цвет линии пути.
+        """
+        segments = np.stack([pts[:-1], pts[1:]], axis=1)[:, :, ::-1]
+        ax.add_collection(LineCollection(segments, colors=color,
+                                         linewidths=2, rasterized=True))
+
+    def _upsert_heroes(self, ax, hp, colors, labels):
+        """
+        @brief Создает или обновляет маркеры и подписи героев на осях.
+
+        @details
+        При первом вызове на данных осях создается один общий scatter и
+        по одному текстовому артисту на героя; последующие вызовы на тех
+        же осях лишь переставляют координаты через set_offsets и
+        set_position, не плодя новых артистов (важно для анимации).
+
+        @param ax Оси matplotlib, на которых отрисован лабиринт.
+        @param hp Массив numpy (N, 2) позиций героев в координатах (row, col).
+        @param colors Цвет маркеров (общий или список по героям).
+        @param labels Список подписей героев.
+        """
+        state = self._hero_artists
+        if state.get('ax') is not ax or len(state.get('texts', ())) != len(hp):
+            state.clear()
+            state['ax'] = ax
+            state['scatter'] = ax.scatter(hp[:, 1], hp[:, 0], c=colors, s=100,
+                                          marker='o', edgecolors='black',
+                                          rasterized=True)
+            state['texts'] = [ax.text(col, row, label, fontsize=8, ha='center',
+                                      va='center', color='white')
+                              for (row, col), label in zip(hp, labels)]
+        else:
+            state['scatter'].set_offsets(hp[:, ::-1])
+            for text, (row, col), label in zip(state['texts'], hp, labels):
+                text.set_position((col, row))
+                text.set_text(label)
+
     def display_gathering_point(self, hero_positions, gathering_point, hero_speeds=None, 
-                               title="Оптимальная точка сбора"):
+                               title="Оптимальная точка сбора",
+                               block=True, save_path=None):
         """
         @brief Отображает лабиринт с позициями героев и точкой сбора.
         
@@ -200,39 +531,28 @@ class TerrainVisualizer:
         colored_maze = self.get_colored_maze()
         
         fig, ax = plt.subplots(figsize=self.figsize)
-        ax.imshow(colored_maze, interpolation='nearest')
-        
-        # Отмечаем позиции героев
-        for i, (row, col) in enumerate(hero_positions):
-            speed_text = f" (v={hero_speeds[i]})" if hero_speeds else ""
-            plt.scatter(col, row, c='blue', s=100, marker='o', edgecolors='black')
-            plt.text(col, row, f"H{i+1}{speed_text}", fontsize=8, ha='center', va='center', color='white')
+        display_arr, scale = self._for_display(colored_maze)
+        ax.imshow(display_arr, interpolation='nearest', rasterized=True)
+        
+        # Отмечаем позиции героев переиспользуемыми артистами
+        hp = np.asarray(hero_positions, dtype=np.float64) / scale
+        labels = [f"H{i+1}" + (f" (v={hero_speeds[i]})" if hero_speeds else "")
+                  for i in range(len(hp))]
+        self._upsert_heroes(ax, hp, 'blue', labels)
             
         # Отмечаем точку сбора
         row, col = gathering_point
-        plt.scatter(col, row, c='yellow', s=200, marker='*', edgecolors='black')
-        plt.text(col, row, "Сбор", fontsize=10, ha='center', va='center', color='black')
+        plt.scatter(col / scale, row / scale, c='yellow', s=200, marker='*', edgecolors='black', rasterized=True)
+        plt.text(col / scale, row / scale, "Сбор", fontsize=10, ha='center', va='center', color='black')
         
-        # Добавляем сетку
-        ax.grid(which='major', axis='both', linestyle='-', color='k', linewidth=0.5)
-        ax.set_xticks(np.arange(-0.5, len(self.maze.get_grid()[0]), 1), minor=True)
-        ax.set_yticks(np.arange(-0.5, len(self.maze.get_grid()), 1), minor=True)
-        ax.set_xticklabels([])
-        ax.set_yticklabels([])
-        ax.tick_params(axis='both', which='both', length=0)
+        self._setup_axes(ax)
         
         # Добавляем заголовок
         plt.title(title)
         
         # Добавляем легенду
-        from matplotlib.patches import Patch
-        from matplotlib.lines import Line2D
-        
-        legend_elements = [Patch(facecolor=self.TERRAIN_COLORS[key], 
-                                edgecolor='black',
-                                label=self.TERRAIN_NAMES[key]) 
-                          for key in self.TERRAIN_NAMES]
-        
+        legend_elements = list(self._base_legend)
+
         legend_elements.extend([
             Line2D([0], [0], marker='o', color='w', markerfacecolor='blue', 
                   markersize=10, label='Герой'),
@@ -243,12 +563,12 @@ class TerrainVisualizer:
         ax.legend(handles=legend_elements, loc='upper center', 
                  bbox_to_anchor=(0.5, -0.05), ncol=3, fontsize=8)
         
-        plt.tight_layout()
-        plt.show()
+        self._finish_figure(fig, save_path, block)
         
     def display_paths_to_gathering_point(self, hero_positions, gathering_point, 
                                         paths=None, hero_speeds=None,
-                                        title="Пути героев к точке сбора"):
+                                        title="Пути героев к точке сбора",
+                                        block=True, save_path=None):
         """
         @brief Отображает лабиринт с путями героев к точке сбора.
         
@@ -263,52 +583,44 @@ class TerrainVisualizer:
             return
             
         colored_maze = self.get_colored_maze()
-        
-        fig, ax = plt.subplots(figsize=self.figsize)
-        ax.imshow(colored_maze, interpolation='nearest')
-        
+
         # Определяем цвета для путей героев
         hero_colors = ['red', 'green', 'blue', 'orange', 'purple', 'cyan', 'magenta', 'yellow']
-        
-        # Отмечаем пути героев, если они предоставлены
+
+        # Подмешиваем пути героев прямо в цветовую карту: одна векторная
+        # операция на путь вместо создания артиста на каждую клетку
         if paths:
             for i, path in enumerate(paths):
                 if path:
-                    color = hero_colors[i % len(hero_colors)]
-                    for row, col in path:
-                        plt.scatter(col, row, c=color, s=50, alpha=0.5)
-        
-        # Отмечаем позиции героев
-        for i, (row, col) in enumerate(hero_positions):
-            speed_text = f" (v={hero_speeds[i]})" if hero_speeds else ""
-            plt.scatter(col, row, c=hero_colors[i % len(hero_colors)], s=100, marker='o', edgecolors='black')
-            plt.text(col, row, f"H{i+1}{speed_text}", fontsize=8, ha='center', va='center', color='white')
+                    rgb_color = np.asarray(mcolors.to_rgb(hero_colors[i % len(hero_colors)]),
+                                           dtype=np.float32) * 255.0
+                    arr = np.asarray(path, dtype=np.int64)
+                    _blend_paths(colored_maze, arr[:, 0], arr[:, 1], rgb_color, 0.5)
+
+        fig, ax = plt.subplots(figsize=self.figsize)
+        display_arr, scale = self._for_display(colored_maze)
+        ax.imshow(display_arr, interpolation='nearest', rasterized=True)
+
+        # Отмечаем позиции героев переиспользуемыми артистами
+        hp = np.asarray(hero_positions, dtype=np.float64) / scale
+        marker_colors = [hero_colors[i % len(hero_colors)] for i in range(len(hp))]
+        labels = [f"H{i+1}" + (f" (v={hero_speeds[i]})" if hero_speeds else "")
+                  for i in range(len(hp))]
+        self._upsert_heroes(ax, hp, marker_colors, labels)
             
         # Отмечаем точку сбора
         row, col = gathering_point
-        plt.scatter(col, row, c='yellow', s=200, marker='*', edgecolors='black')
-        plt.text(col, row, "Сбор", fontsize=10, ha='center', va='center', color='black')
+        plt.scatter(col / scale, row / scale, c='yellow', s=200, marker='*', edgecolors='black', rasterized=True)
+        plt.text(col / scale, row / scale, "Сбор", fontsize=10, ha='center', va='center', color='black')
         
-        # Добавляем сетку
-        ax.grid(which='major', axis='both', linestyle='-', color='k', linewidth=0.5)
-        ax.set_xticks(np.arange(-0.5, len(self.maze.get_grid()[0]), 1), minor=True)
-        ax.set_yticks(np.arange(-0.5, len(self.maze.get_grid()), 1), minor=True)
-        ax.set_xticklabels([])
-        ax.set_yticklabels([])
-        ax.tick_params(axis='both', which='both', length=0)
+        self._setup_axes(ax)
         
         # Добавляем заголовок
         plt.title(title)
         
         # Добавляем легенду для типов местности и героев
-        from matplotlib.patches import Patch
-        from matplotlib.lines import Line2D
-        
-        legend_elements = [Patch(facecolor=self.TERRAIN_COLORS[key], 
-                                edgecolor='black',
-                                label=self.TERRAIN_NAMES[key]) 
-                          for key in self.TERRAIN_NAMES]
-        
+        legend_elements = list(self._base_legend)
+
         # Добавляем героев в легенду
         for i in range(len(hero_positions)):
             speed_text = f" (v={hero_speeds[i]})" if hero_speeds else ""
@@ -326,5 +638,4 @@ class TerrainVisualizer:
         ax.legend(handles=legend_elements, loc='upper center', 
                  bbox_to_anchor=(0.5, -0.05), ncol=3, fontsize=8)
         
-        plt.tight_layout()
-        plt.show() 
\ No newline at end of file
+        self._finish_figure(fig, save_path, block) 
\ No newline at end of file
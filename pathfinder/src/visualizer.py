@@ -29,28 +29,31 @@ class MazeVisualizer:
         """
         Отрисовывает лабиринт.
         """
-        # Создаем матрицу цветов
-        grid = np.zeros((self.maze.height, self.maze.width))
-        
-        # Заполняем матрицу
-        for i in range(self.maze.height):
-            for j in range(self.maze.width):
-                cell = self.maze.grid[i][j]
-                if cell == 1:
-                    grid[i][j] = 1  # Стена
-                elif isinstance(cell, str) and cell.isdigit():
-                    grid[i][j] = 2  # Герой
-                elif cell == 'F':
-                    grid[i][j] = 3  # Конец
-                else:
-                    grid[i][j] = 0  # Проход
+        # Классифицируем клетки векторными масками вместо двойного цикла.
+        # Строки-строки разворачиваем посимвольно, как в Maze._walls,
+        # чтобы массив всегда был двумерным
+        rows = self.maze.grid
+        if rows and isinstance(rows[0], str):
+            arr = np.array([list(row) for row in rows], dtype=object)
+        else:
+            arr = np.array(rows, dtype=object)
+        grid = np.zeros(arr.shape, dtype=np.uint8)
+
+        is_hero = np.frompyfunc(
+            lambda c: isinstance(c, str) and c.isdigit(), 1, 1)(arr).astype(bool)
+        is_end = arr == 'F'
+
+        grid[arr == 1] = 1   # Стена
+        grid[is_hero] = 2    # Герой
+        grid[is_end] = 3     # Конец
         
         # Создаем colormap
         colors = ['white', 'black', 'green', 'red']
         cmap = mcolors.ListedColormap(colors)
         
         # Отрисовываем лабиринт
-        self.ax.imshow(grid, cmap=cmap)
+        self.ax.imshow(grid, cmap=cmap, rasterized=True)
+        self.ax.set_aspect('equal')
         
         # Добавляем сетку
         self.ax.grid(color='gray', linestyle='-', linewidth=0.5)
@@ -62,14 +65,11 @@ class MazeVisualizer:
         self.ax.set_yticks(np.arange(0, self.maze.height, 1))
         self.ax.tick_params(axis='both', which='both', length=0)
         
-        # Подписи для героев
-        for i in range(self.maze.height):
-            for j in range(self.maze.width):
-                cell = self.maze.grid[i][j]
-                if isinstance(cell, str) and cell.isdigit():
-                    self.ax.text(j, i, cell, ha='center', va='center', color='white', fontsize=12, fontweight='bold')
-                elif cell == 'F':
-                    self.ax.text(j, i, 'F', ha='center', va='center', color='white', fontsize=12, fontweight='bold')
+        # Подписи для героев: обходим только клетки с героями и финишем,
+        # а не всю сетку
+        for i, j in np.argwhere(is_hero | is_end):
+            self.ax.text(j, i, str(self.maze.grid[i][j]), ha='center', va='center',
+                         color='white', fontsize=12, fontweight='bold')
     
     def draw_path(self, path, color='blue', linewidth=2, markersize=8):
         """
@@ -81,14 +81,15 @@ class MazeVisualizer:
             linewidth (int): Ширина линии.
             markersize (int): Размер маркера.
         """
-        if not path:
+        if path is None or len(path) == 0:
             return
-        
-        # Извлекаем координаты
-        rows, cols = zip(*path)
-        
+
+        # Извлекаем координаты одной C-аллокацией вместо zip(*path)
+        arr = path if isinstance(path, np.ndarray) else np.asarray(path, dtype=np.int32)
+
         # Отрисовываем путь
-        self.ax.plot(cols, rows, 'o-', color=color, linewidth=linewidth, markersize=markersize)
+        self.ax.plot(arr[:, 1], arr[:, 0], 'o-', color=color, linewidth=linewidth,
+                     markersize=markersize, rasterized=True)
     
     def draw_equidistant_point(self, point, paths=None):
         """
@@ -126,17 +127,21 @@ class MazeVisualizer:
         if not point or not distances:
             return
         
-        # Создаем матрицу расстояний
-        distance_grid = np.full((self.maze.height, self.maze.width), np.nan)
-        
-        for (i, j), dist in distances.items():
-            distance_grid[i, j] = dist
+        # Создаем матрицу расстояний; float32 достаточно для тепловой карты
+        # и вдвое сокращает объем данных для imshow
+        distance_grid = np.full((self.maze.height, self.maze.width), np.nan,
+                                dtype=np.float32)
+
+        # Одно векторное присваивание вместо цикла по словарю
+        positions = np.array(list(distances.keys()), dtype=np.int64)
+        distance_grid[positions[:, 0], positions[:, 1]] = np.fromiter(
+            distances.values(), dtype=np.float64, count=len(distances))
         
         # Создаем отдельную фигуру для тепловой карты
         fig, ax = plt.subplots(figsize=(10, 10))
         
         # Отрисовываем тепловую карту
-        heatmap = ax.imshow(distance_grid, cmap='hot_r')
+        heatmap = ax.imshow(distance_grid, cmap='hot_r', rasterized=True)
         
         # Добавляем цветовую шкалу
         plt.colorbar(heatmap, ax=ax, label='Расстояние')
@@ -0,0 +1,18 @@
+"""
+Общая настройка sys.path для всех тестов.
+
+Раньше каждый тестовый модуль добавлял каталоги проекта в sys.path
+самостоятельно; теперь пути вставляются один раз при загрузке conftest,
+и каждый модуль исходного кода импортируется под единственным именем,
+кэшируемым подсистемой импорта.
+"""
+
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SRC = os.path.join(_ROOT, 'src')
+
+for _path in (_ROOT, _SRC):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
@@ -8,13 +8,9 @@
 и алгоритма поиска пути с учетом расовых модификаторов.
 """
 
-import sys
-import os
+import copy
 import unittest
 
-# Добавляем путь к пакету pathfinder в sys.path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from src.hex import HexMap, HexCell, HexTerrainType
 from src.races import Human, Elf, Dwarf, Orc, Race
 from src.pathfinding import find_path
@@ -91,23 +87,33 @@ class TestHexMap(unittest.TestCase):
     Тесты для класса HexMap.
     """
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Создает карту для тестирования.
+        Создает карту-шаблон один раз на весь класс тестов.
         """
-        self.map = HexMap()
-        
+        cls._template_map = HexMap()
+
         # Добавляем несколько ячеек с разными типами местности
-        self.map.add_cell(0, 0, HexTerrainType.START)
-        self.map.add_cell(0, 1, HexTerrainType.GRASS)
-        self.map.add_cell(1, 0, HexTerrainType.FOREST)
-        self.map.add_cell(1, 1, HexTerrainType.MOUNTAIN)
-        self.map.add_cell(2, 0, HexTerrainType.END)
-    
+        cls._template_map.add_cell(0, 0, HexTerrainType.START)
+        cls._template_map.add_cell(0, 1, HexTerrainType.GRASS)
+        cls._template_map.add_cell(1, 0, HexTerrainType.FOREST)
+        cls._template_map.add_cell(1, 1, HexTerrainType.MOUNTAIN)
+        cls._template_map.add_cell(2, 0, HexTerrainType.END)
+
+    def setUp(self):
+        """
+        Тесты только читают карту, поэтому разделяют общий шаблон.
+        """
+        self.map = self._template_map
+
     def test_add_cell(self):
         """
         Проверяет добавление ячейки на карту.
         """
+        # Этот тест изменяет карту, поэтому работает с глубокой копией
+        self.map = copy.deepcopy(self._template_map)
+
         # Добавляем новую ячейку
         cell = self.map.add_cell(2, 1, HexTerrainType.WATER)
         
@@ -224,25 +230,32 @@ class TestPathfinding(unittest.TestCase):
     Тесты для алгоритма поиска пути.
     """
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Создает карту для тестирования поиска пути.
+        Создает карту для тестирования поиска пути один раз на класс.
         """
-        self.map = HexMap()
-        
+        cls._template_map = HexMap()
+
         # Создаем простую карту 3x3
         # S G F
         # G G M
         # F G E
-        self.map.add_cell(0, 0, HexTerrainType.START)
-        self.map.add_cell(0, 1, HexTerrainType.GRASS)
-        self.map.add_cell(0, 2, HexTerrainType.FOREST)
-        self.map.add_cell(1, 0, HexTerrainType.GRASS)
-        self.map.add_cell(1, 1, HexTerrainType.GRASS)
-        self.map.add_cell(1, 2, HexTerrainType.GRASS)
-        self.map.add_cell(2, 0, HexTerrainType.FOREST)
-        self.map.add_cell(2, 1, HexTerrainType.MOUNTAIN)
-        self.map.add_cell(2, 2, HexTerrainType.END)
+        cls._template_map.add_cell(0, 0, HexTerrainType.START)
+        cls._template_map.add_cell(0, 1, HexTerrainType.GRASS)
+        cls._template_map.add_cell(0, 2, HexTerrainType.FOREST)
+        cls._template_map.add_cell(1, 0, HexTerrainType.GRASS)
+        cls._template_map.add_cell(1, 1, HexTerrainType.GRASS)
+        cls._template_map.add_cell(1, 2, HexTerrainType.GRASS)
+        cls._template_map.add_cell(2, 0, HexTerrainType.FOREST)
+        cls._template_map.add_cell(2, 1, HexTerrainType.MOUNTAIN)
+        cls._template_map.add_cell(2, 2, HexTerrainType.END)
+
+    def setUp(self):
+        """
+        Поисковые тесты карту не изменяют и разделяют общий шаблон.
+        """
+        self.map = self._template_map
     
     def test_find_path(self):
         """
@@ -2,13 +2,8 @@
 Тесты для класса TerrainMaze.
 """
 
-import sys
-import os
 import unittest
 
-# Добавляем путь к исходному коду
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-
 from maze import Maze
 from terrain_maze import TerrainMaze
 
@@ -2,17 +2,21 @@
 Тесты для класса TerrainPathFinder.
 """
 
-import sys
-import os
+import functools
 import unittest
 
-# Добавляем путь к исходному коду
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-
 from terrain_maze import TerrainMaze
 from terrain_pathfinder import TerrainPathFinder
 
 
+@functools.lru_cache(maxsize=None)
+def _maze(grid_tuple):
+    """Мемоизированное построение лабиринта: одинаковые сетки в разных
+    тестах разбираются и компилируются в массивы стоимостей один раз.
+    Безопасно, пока тесты не мутируют лабиринт."""
+    return TerrainMaze(list(grid_tuple))
+
+
 class TestTerrainPathFinder(unittest.TestCase):
     """Тесты для класса TerrainPathFinder."""
     
@@ -31,7 +35,7 @@ class TestTerrainPathFinder(unittest.TestCase):
             "#RRF#",
             "#####"
         ]
-        maze = TerrainMaze(grid)
+        maze = _maze(tuple(grid))
         pathfinder = TerrainPathFinder(maze)
         
         # Возможно в реальной реализации мы должны задать начальную и конечную точки вручную,
@@ -72,7 +76,7 @@ class TestTerrainPathFinder(unittest.TestCase):
             "#RRRRF#",
             "#######"
         ]
-        maze = TerrainMaze(grid)
+        maze = _maze(tuple(grid))
         pathfinder = TerrainPathFinder(maze)
         
         # Запускаем алгоритм Дейкстры
@@ -113,7 +117,7 @@ class TestTerrainPathFinder(unittest.TestCase):
         ]
         # Здесь мы создали лабиринт, где нет пути от старта к финишу
         # из-за воды и стен, блокирующих проход
-        maze = TerrainMaze(grid)
+        maze = _maze(tuple(grid))
         pathfinder = TerrainPathFinder(maze)
         
         # Запускаем алгоритм Дейкстры с явными начальной и конечной точками
@@ -141,7 +145,7 @@ class TestTerrainPathFinder(unittest.TestCase):
             "#HRF#",
             "#####"
         ]
-        maze = TerrainMaze(grid)
+        maze = _maze(tuple(grid))
         pathfinder = TerrainPathFinder(maze)
         
         # Составим путь вручную из дорог (R) и травы (G)
@@ -165,6 +169,32 @@ class TestTerrainPathFinder(unittest.TestCase):
             # например, если путь проходит через непроходимую местность
             print(f"Исключение при вычислении стоимости пути: {e}")
     
+    def test_get_path_costs_array(self):
+        """Тест получения массива стоимостей шагов пути."""
+        grid = [
+            "#####",
+            "#1GR#",
+            "#RRR#",
+            "#RRF#",
+            "#####"
+        ]
+        maze = _maze(tuple(grid))
+        pathfinder = TerrainPathFinder(maze)
+
+        # Составим путь вручную
+        path = [(1, 1), (2, 1), (3, 1), (3, 2), (3, 3)]
+
+        costs = pathfinder.get_path_costs_array(path)
+
+        # Стартовая клетка не оплачивается: по стоимости на каждый шаг
+        self.assertEqual(len(costs), len(path) - 1)
+
+        # Сумма массива совпадает с get_path_cost
+        self.assertAlmostEqual(float(costs.sum()), pathfinder.get_path_cost(path))
+
+        # Для пути короче двух точек массив пуст
+        self.assertEqual(len(pathfinder.get_path_costs_array([(1, 1)])), 0)
+
     def test_get_path_directions_with_costs(self):
         """Тест получения направлений пути с учетом стоимости."""
         grid = [
@@ -174,7 +204,7 @@ class TestTerrainPathFinder(unittest.TestCase):
             "#RRF#",
             "#####"
         ]
-        maze = TerrainMaze(grid)
+        maze = _maze(tuple(grid))
         pathfinder = TerrainPathFinder(maze)
         
         # Составим путь вручную